@@ -0,0 +1,100 @@
+import json
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Load JSON configuration
+with open('parameters.json') as f:
+    CONFIG = json.load(f)
+
+
+class LocalClient:
+    """
+    Calls the Flask handlers' compute functions in the same process, without
+    JSON serialization or a network round-trip.
+    """
+
+    def __init__(self):
+        # importing the Flask app loads its data once per process
+        import flask_app
+
+        self.handlers = {
+            '/predict': flask_app.compute_predict,
+            '/predict_worldwide': flask_app.compute_predict_worldwide,
+            '/impact_worldwide': flask_app.compute_impact_worldwide,
+            '/scenario_worldwide': flask_app.compute_scenario_worldwide,
+        }
+
+    def post(self, path, payload):
+        return self.handlers[path](payload)
+
+
+class HttpClient:
+    """
+    Posts to a running Flask app over a keep-alive session, so connections are
+    pooled and reused across calls.
+
+    Every endpoint is a pure function of its payload, so POSTs are retried
+    (with backoff) on connection errors and 502/503/504 responses.
+    """
+
+    def __init__(self, base_url, timeout=10, retries=3, pool_size=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset(['POST']),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, path, payload):
+        response = self.session.post(self.base_url + path, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def get_client(backend=None):
+    """
+    Create the API client selected by config.
+
+    The backend is taken from the `backend` argument, then the GMED_API_BACKEND
+    environment variable, then "api_backend" in parameters.json.
+
+    Args:
+        backend (str): 'local' or 'http'.
+
+    Returns:
+        LocalClient or HttpClient: Client with a `post(path, payload)` method
+        returning the response JSON as a dict.
+    """
+    backend = backend or os.environ.get('GMED_API_BACKEND') or CONFIG.get('api_backend', 'local')
+
+    if backend == 'local':
+        return LocalClient()
+    if backend == 'http':
+        return HttpClient(
+            os.environ.get('GMED_API_URL') or CONFIG.get('api_url', 'http://localhost:5000'),
+            timeout=CONFIG.get('api_timeout', 10),
+            retries=CONFIG.get('api_retries', 3),
+        )
+    raise ValueError(f"Unknown API backend: {backend}")
+
+
+@st.cache_resource
+def get_shared_client(backend=None):
+    """
+    `get_client` cached with st.cache_resource, so every Streamlit session and
+    rerun reuses the same client and its connection pool.
+    """
+    return get_client(backend)
@@ -0,0 +1,106 @@
+import json
+import os
+
+import streamlit as st
+
+from build_artifacts import load_worldwide_total
+from data_access import WorldData
+from data_store import TABLES, load_table
+from model import Model
+
+
+# Every loader is keyed on the source file's modification time, so reruns reuse
+# the cached copy and an edited file is picked up on the next rerun.
+
+
+@st.cache_data
+def _read_json(path, mtime):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_config(path='parameters.json'):
+    return _read_json(path, os.path.getmtime(path))
+
+
+@st.cache_resource
+def _load_table(name, mtime):
+    return load_table(name)
+
+
+def get_table(name):
+    """Table of the columnar store (see data_store.TABLES), shared read-only across reruns."""
+    return _load_table(name, os.path.getmtime(TABLES[name]['source']))
+
+
+@st.cache_resource
+def get_model():
+    return Model()
+
+
+@st.cache_resource
+def _load_world_data(mtime):
+    return WorldData(_load_table('world_data', mtime))
+
+
+def load_world_data():
+    return _load_world_data(os.path.getmtime(TABLES['world_data']['source']))
+
+
+@st.cache_resource
+def _worldwide_total(path, mtime, projected_year, backcast):
+    # read-only, memory-mapped artifact; rebuilt by build_artifacts if the source hash changed
+    return load_worldwide_total(path, projected_year=projected_year, backcast=backcast)
+
+
+def worldwide_total(projected_year=2034):
+    """Economic burden of every country and disease summed by Year."""
+    path = TABLES['world_data']['source']
+    return _worldwide_total(path, os.path.getmtime(path), projected_year, load_config().get('backcast', 'per_disease'))
+
+
+@st.cache_data
+def _country_projections(mtime, country, projected_year, forecaster, backcast):
+    model = get_model()
+    world_data = _load_world_data(mtime)
+
+    economic_burden = model.transform_country_disease_new(world_data, country, backcast)
+    economic_burden_transformed = model.extend_years(economic_burden, projected_year, forecaster)
+
+    prevalence_data = model.transform_country_disease_prevalence_new(world_data, country)
+    prevalence_data_transformed = model.extend_years(prevalence_data, projected_year, forecaster)
+
+    return economic_burden_transformed, prevalence_data_transformed
+
+
+def country_projections(country, projected_year=2034, forecaster=None):
+    """Projected (economic burden, prevalence) tables of a country, years as index."""
+    return _country_projections(os.path.getmtime(TABLES['world_data']['source']), country, projected_year, forecaster,
+                                load_config().get('backcast', 'per_disease'))
+
+
+@st.cache_data
+def _country_charts(mtime, country, disease, projected_year, forecaster, backcast):
+    economic_burden_transformed, prevalence_data_transformed = _country_projections(
+        mtime, country, projected_year, forecaster, backcast)
+    model = get_model()
+    return (model.line_chart_economy(economic_burden_transformed, disease),
+            model.line_chart(prevalence_data_transformed, disease))
+
+
+def country_charts(country, disease, projected_year=2034, forecaster=None):
+    """(economic burden, prevalence) line charts of a (country, disease)."""
+    return _country_charts(os.path.getmtime(TABLES['world_data']['source']), country, disease, projected_year, forecaster,
+                           load_config().get('backcast', 'per_disease'))
+
+
+@st.cache_data
+def _table_line_chart(name, mtime, column, economy):
+    data = _load_table(name, mtime)
+    model = get_model()
+    return model.line_chart_economy(data, column) if economy else model.line_chart(data, column)
+
+
+def table_line_chart(name, column, economy=False):
+    """Line chart of one column of a year-indexed table (prevalence, or economy burden if `economy`)."""
+    return _table_line_chart(name, os.path.getmtime(TABLES[name]['source']), column, economy)
@@ -0,0 +1,172 @@
+"""
+ASGI serving mode of the API, for production load.
+
+    python asgi_app.py                   # settings under "asgi" in parameters.json
+    uvicorn asgi_app:app --workers 4     # or with uvicorn's own options
+
+Serves the /predict, /predict_worldwide and /impact_worldwide contracts of
+flask_app (plus /scenario_worldwide and the /predict/batch and
+/scenario_worldwide/batch bodies) with the same compute functions, encoded
+with orjson. A single scenario is a few array lookups and runs on the event
+loop; its encoded response is cached (see response_cache). Batch bodies are
+CPU-bound, so they run in a process pool per worker and do not hold up the
+worker's other requests.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import orjson
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+import flask_app
+from response_cache import ResponseCache
+
+
+with open("parameters.json") as f:
+    CONFIG = json.load(f)
+
+# host and port, uvicorn worker processes, batch pool processes per worker (0
+# computes batches on the event loop), and concurrent connections per worker
+# before uvicorn answers 503
+DEFAULT_SETTINGS = {
+    "host": "0.0.0.0",
+    "port": 8000,
+    "workers": 2,
+    "batch_processes": 1,
+    "limit_concurrency": 1024,
+}
+
+
+def asgi_settings():
+    """
+    Serving settings: DEFAULT_SETTINGS, overridden by "asgi" in
+    parameters.json, overridden by GMED_ASGI_<NAME> environment variables
+    (e.g. GMED_ASGI_WORKERS).
+    """
+    settings = {**DEFAULT_SETTINGS, **CONFIG.get("asgi", {})}
+    for name, value in settings.items():
+        override = os.environ.get(f"GMED_ASGI_{name.upper()}")
+        if override is not None:
+            settings[name] = type(value)(override)
+    return settings
+
+
+SETTINGS = asgi_settings()
+
+# bodies of the single-scenario endpoints, per worker, see response_cache
+response_cache = ResponseCache.from_config(CONFIG)
+
+
+def encode_json(content):
+    # sorted keys, like Flask's jsonify
+    return orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_response(content, status_code=200):
+    return Response(encode_json(content), status_code, media_type="application/json")
+
+
+def endpoint(compute):
+    async def handle(request):
+        # the world data may have been rebuilt by another worker, see flask_app.follow_store
+        flask_app.follow_store()
+        try:
+            data = flask_app.json_object(orjson.loads(await request.body()))
+            body = response_cache.get_or_encode(request.url.path, data, flask_app.data_version, compute, encode_json)
+        except (KeyError, ValueError) as e:
+            return json_response({"error": str(e)}, 400)
+
+        return Response(body, media_type="application/json")
+
+    return handle
+
+
+async def cache_stats(request):
+    return json_response(response_cache.stats())
+
+
+def batch_body(data, scenarios, results):
+    """
+    Batch response as (media type, bytes): NDJSON (default) or, with
+    "format": "columnar", one JSON object holding a list per field.
+    """
+    inputs, outputs = flask_app.batch_columns(scenarios, results)
+
+    if data.get("format", "ndjson") == "columnar":
+        body = {"count": len(next(iter(inputs.values()))), **inputs, **outputs}
+        return "application/json", orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+
+    fields = list(inputs) + list(outputs)
+    rows = (orjson.dumps(dict(zip(fields, row))) + b"\n" for row in zip(*inputs.values(), *outputs.values()))
+    return "application/x-ndjson", b"".join(rows)
+
+
+def predict_batch(data):
+    scenarios = flask_app.batch_scenarios(data)
+    return batch_body(data, scenarios, flask_app.predict_arrays(**scenarios))
+
+
+def scenario_worldwide_batch(data):
+    # in a pool process, which holds its own copy of the world data
+    flask_app.follow_store()
+    scenarios = flask_app.batch_scenarios(data, flask_app.WORLDWIDE_SCENARIO_FIELDS)
+    results = flask_app.scenario_worldwide_arrays(**scenarios, forecaster=data.get("forecaster"))
+    return batch_body(data, scenarios, results)
+
+
+def batch_endpoint(compute):
+    async def handle(request):
+        pool = request.app.state.pool
+        try:
+            data = flask_app.json_object(orjson.loads(await request.body()))
+            if pool is None:
+                media_type, body = compute(data)
+            else:
+                # the body is encoded in the pool too, so only bytes come back
+                media_type, body = await asyncio.get_running_loop().run_in_executor(pool, compute, data)
+        except (KeyError, ValueError) as e:
+            return json_response({"error": str(e)}, 400)
+
+        return Response(body, media_type=media_type)
+
+    return handle
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.pool = None
+    if SETTINGS["batch_processes"] > 0:
+        # spawn rather than fork: the worker already runs an event loop
+        app.state.pool = ProcessPoolExecutor(SETTINGS["batch_processes"], mp_context=multiprocessing.get_context("spawn"))
+        # start the pool (each process loads the data) before the first batch arrives
+        await asyncio.get_running_loop().run_in_executor(app.state.pool, int)
+    yield
+    if app.state.pool is not None:
+        app.state.pool.shutdown(cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route("/predict", endpoint(flask_app.compute_predict), methods=["POST"]),
+        Route("/predict/batch", batch_endpoint(predict_batch), methods=["POST"]),
+        Route("/predict_worldwide", endpoint(flask_app.compute_predict_worldwide), methods=["POST"]),
+        Route("/scenario_worldwide", endpoint(flask_app.compute_scenario_worldwide), methods=["POST"]),
+        Route("/scenario_worldwide/batch", batch_endpoint(scenario_worldwide_batch), methods=["POST"]),
+        Route("/impact_worldwide", endpoint(flask_app.compute_impact_worldwide), methods=["POST"]),
+        Route("/cache/stats", cache_stats, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("asgi_app:app", host=SETTINGS["host"], port=SETTINGS["port"], workers=SETTINGS["workers"],
+                limit_concurrency=SETTINGS["limit_concurrency"])
@@ -0,0 +1,36 @@
+"""
+Memory of the data tables held by each API worker and Streamlit session.
+
+    python bench_memory.py [--table world_data]
+
+Compares, per column, a plain `pd.read_csv` of the source (object strings,
+float64) with the typed table loaded from the store (categorical keys, parsed
+ratios, downcast numerics), using pandas' deep memory usage. Every worker
+holds one copy of each table, so the totals are per worker.
+"""
+import argparse
+
+import pandas as pd
+
+from data_store import TABLES, memory_report
+
+
+def main(tables):
+    totals = {}
+    for name in tables:
+        report = memory_report(name)
+        print(f"\n{name} ({TABLES[name]['source']})")
+        print(report.to_string())
+        totals[name] = report.loc['total', ['csv_bytes', 'store_bytes']]
+
+    totals = pd.DataFrame(totals).T
+    totals.loc['per worker'] = totals.sum()
+    totals['saved'] = (1 - totals['store_bytes'] / totals['csv_bytes']).map('{:.0%}'.format)
+    print("\n" + totals.to_string())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--table', action='append', choices=list(TABLES),
+                        help='table to report (repeatable); all tables by default')
+    main(parser.parse_args().table or list(TABLES))
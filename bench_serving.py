@@ -0,0 +1,152 @@
+"""
+Load test of the Flask app against the ASGI serving mode.
+
+    python bench_serving.py [--duration 10] [--concurrency 32] [--workers 2]
+
+Starts each server in its own process group: `python flask_app.py` (the
+current debug server) on port 5000, and asgi_app under uvicorn with
+`--workers` workers on port 8000. It then keeps `--concurrency` keep-alive
+connections busy for `--duration` seconds per endpoint. The client is a
+minimal asyncio HTTP/1.1 client, so the load generator itself stays cheap.
+The report gives requests per second and the p50 / p95 / p99 latency of
+each server and endpoint.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+PAYLOADS = {
+    '/predict': [
+        {"disease": disease, "province": province, "year": year, "clinics": 5, "providers": 3, "capacity_pct": 50}
+        for disease in ["Diabetes", "Hypertension"] for province in ["Jawa Barat", "Bali"] for year in [2025, 2030]
+    ],
+    '/predict_worldwide': [
+        {"country": country, "disease": "Stroke", "year": year}
+        for country in ["Portugal", "India", "Malaysia"] for year in [2025, 2030]
+    ],
+    '/impact_worldwide': [
+        {"country": country, "disease": "Stroke", "clinic_count": 50, "provider_count": 2, "capacity_pct": 20,
+         "susceptible_undiagnosed": 100000, "economic_burden": 1e9}
+        for country in ["Portugal", "India", "Malaysia"]
+    ],
+}
+
+SERVERS = {
+    'flask': (5000, lambda workers: [sys.executable, 'flask_app.py']),
+    'asgi': (8000, lambda workers: [sys.executable, '-m', 'uvicorn', 'asgi_app:app', '--port', '8000',
+                                    '--workers', str(workers), '--log-level', 'warning']),
+}
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, value = line.decode().split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while (size := int((await reader.readline()).strip(), 16)) > 0:
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.read()
+        headers['connection'] = 'close'
+
+    keep_alive = status_line.startswith(b"HTTP/1.1") and headers.get('connection', '').lower() != 'close'
+    return int(status_line.split()[1]), keep_alive
+
+
+async def connection(port, path, bodies, deadline, latencies, errors):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        body = next(bodies)
+        request = (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                   f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            errors.append(path)
+            writer = None
+            continue
+        latencies.append(time.perf_counter() - start)
+        if status != 200:
+            errors.append(status)
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, path, concurrency, duration):
+    bodies = itertools.cycle([json.dumps(payload).encode() for payload in PAYLOADS[path]])
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(connection(port, path, bodies, start + duration, latencies, errors)
+                           for _ in range(concurrency)))
+    return len(latencies) / (time.perf_counter() - start), np.array(latencies), errors
+
+
+def wait_until_ready(port, timeout=60):
+    async def probe():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        body = json.dumps(PAYLOADS['/predict'][0]).encode()
+        writer.write((f"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+        await read_response(reader)
+        writer.close()
+
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return asyncio.run(probe())
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def main(duration, concurrency, workers, servers):
+    print(f"{'server':<8}{'endpoint':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name in servers:
+        port, command = SERVERS[name]
+        # own process group, so the debug reloader's child goes down with it
+        server = subprocess.Popen(command(workers), start_new_session=True,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready(port)
+            for path in PAYLOADS:
+                rate, latencies, errors = asyncio.run(load(port, path, concurrency, duration))
+                p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+                print(f"{name:<8}{path:<20}{rate:>10,.0f}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}{len(errors):>8}")
+        finally:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--duration', type=float, default=10, help='seconds per endpoint')
+    parser.add_argument('--concurrency', type=int, default=32, help='open connections')
+    parser.add_argument('--workers', type=int, default=2, help='uvicorn workers of the ASGI server')
+    parser.add_argument('--servers', nargs='+', choices=list(SERVERS), default=list(SERVERS))
+    args = parser.parse_args()
+    main(args.duration, args.concurrency, args.workers, args.servers)
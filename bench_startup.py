@@ -0,0 +1,58 @@
+"""
+Cold start benchmark of the API workers.
+
+    python bench_startup.py [--runs 10]
+
+Every measurement runs in a fresh interpreter, like a gunicorn worker spawn
+or an autoscaled instance, and reports the median and best wall time of:
+
+- importing the compute core (projection) and the charting Model (model),
+  to show what plotly costs at import;
+- importing flask_app, which also loads the data store and builds the
+  projection index, i.e. the time until a worker can serve requests.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+TARGETS = {
+    'import projection': 'import projection',
+    'import model': 'import model',
+    'flask_app ready': 'import flask_app',
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(statement):
+    # fresh interpreter per run; the data store is warmed by the first run
+    result = subprocess.run(
+        [sys.executable, '-c', TIMER.format(statement=statement)],
+        capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs):
+    for name, statement in TARGETS.items():
+        cold_start(statement)
+        times = [cold_start(statement) for _ in range(runs)]
+        loaded_plotly = subprocess.run(
+            [sys.executable, '-c', f"{statement}; import sys; print('plotly' in sys.modules)"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        print(f"{name:<20} median {statistics.median(times) * 1000:7.1f} ms   "
+              f"best {min(times) * 1000:7.1f} ms   plotly loaded: {loaded_plotly}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    main(parser.parse_args().runs)
@@ -0,0 +1,42 @@
+"""
+Throughput benchmark of the Monte Carlo uncertainty engine.
+
+    python bench_uncertainty.py [--samples 1000000] [--processes 1 4]
+
+Runs one /predict and one /predict_worldwide (with intervention) scenario
+with the distributions of parameters.json and reports samples per second for
+each process pool size.
+"""
+import argparse
+import time
+
+import flask_app
+from uncertainty import simulate, simulate_predict_chunk, simulate_worldwide_chunk
+
+
+PREDICT_SCENARIO = {"disease": "Diabetes", "province": "Jawa Barat", "year": 2030,
+                    "clinics": 5, "providers": 3, "capacity_pct": 50}
+WORLDWIDE_SCENARIO = {"country": "Australia", "disease": "Dementia", "year": 2030,
+                      "clinics": 5, "providers": 3, "capacity_pct": 50}
+
+
+def main(samples, processes):
+    spec = flask_app.uncertainty_options({})['spec']
+    cases = {
+        '/predict': (simulate_predict_chunk, flask_app.predict_uncertainty_inputs(PREDICT_SCENARIO)),
+        '/predict_worldwide': (simulate_worldwide_chunk, flask_app.predict_worldwide_uncertainty_inputs(WORLDWIDE_SCENARIO)),
+    }
+    for name, (chunk_function, inputs) in cases.items():
+        for pool_size in processes:
+            start = time.perf_counter()
+            simulate(chunk_function, inputs, spec, samples, seed=0, processes=pool_size)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<20} processes {pool_size:>2}   {samples / elapsed:>12,.0f} samples/s   ({elapsed:.2f} s)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, default=1_000_000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+    main(args.samples, args.processes)
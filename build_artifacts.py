@@ -0,0 +1,157 @@
+"""
+Build the precomputed data artifacts read by the apps.
+
+    python build_artifacts.py [--force]
+
+The source CSVs are ingested into the typed columnar store (see data_store.py).
+The worldwide economic burden total is written as
+`economic_burden_worldwide_total.csv` (for reading by hand), a `.npy` copy the
+apps memory-map, and a `.json` manifest holding the SHA-256 of the source CSV
+and of the `.npy`. Artifacts are only rebuilt when the source hash (or the
+back-cast mode, see ProjectionModel.transform_country_disease_new) changes.
+
+The projection arrays of the API (economic burden and prevalence of every
+world data row and year) are published to `data_store/` too, so API workers
+attach to one memory-mapped copy instead of each building their own.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_access import WorldData
+from data_store import atomic_write, file_sha256, ingest, shared_arrays
+from forecasting import DEFAULT_FORECASTER
+from projection import BACKCAST_MODES, ProjectionModel
+
+
+WORLD_DATA_PATH = 'world_data_cleaned_new_2.csv'
+WORLDWIDE_TOTAL_PATH = 'economic_burden_worldwide_total'
+PROJECTED_YEAR = 2034
+PROJECTION_ARRAYS = 'projection'
+
+
+def build_worldwide_total(source=WORLD_DATA_PATH, output=WORLDWIDE_TOTAL_PATH, projected_year=PROJECTED_YEAR,
+                          backcast='per_disease'):
+    """
+    Project every country and disease in `source`, sum Economic Burden by Year
+    and write the artifacts.
+
+    Returns:
+        dict: The manifest.
+    """
+    source_hash = file_sha256(source)
+
+    panel = ProjectionModel().project_all_countries(WorldData.from_csv(source), projected_year, backcast=backcast)
+    total = panel.groupby('Year', as_index=False)['Economic Burden ($)'].sum()
+    values = total.to_numpy(dtype=float)
+
+    atomic_write(output + '.csv', lambda f: total.to_csv(f, index=False))
+    atomic_write(output + '.npy', lambda f: np.save(f, values), mode='wb')
+
+    manifest = {
+        'source': source,
+        'source_sha256': source_hash,
+        'projected_year': projected_year,
+        'backcast': backcast,
+        'columns': list(total.columns),
+        'sha256': file_sha256(output + '.npy'),
+    }
+    # manifest last: it is only valid once the data files are in place
+    atomic_write(output + '.json', lambda f: json.dump(manifest, f, indent=2))
+
+    return manifest
+
+
+def ensure_worldwide_total(source=WORLD_DATA_PATH, output=WORLDWIDE_TOTAL_PATH, projected_year=PROJECTED_YEAR,
+                           backcast='per_disease', force=False):
+    """
+    Rebuild the worldwide total only if it is missing or built from a different source.
+
+    Returns:
+        dict: The manifest.
+    """
+    if not force and os.path.exists(output + '.json') and os.path.exists(output + '.npy'):
+        with open(output + '.json') as f:
+            manifest = json.load(f)
+        # manifests without a back-cast mode predate it and used the shared multiplier
+        if (manifest['source_sha256'] == file_sha256(source) and manifest['projected_year'] == projected_year
+                and manifest.get('backcast', 'shared') == backcast):
+            return manifest
+
+    return build_worldwide_total(source, output, projected_year, backcast)
+
+
+def load_worldwide_total(source=WORLD_DATA_PATH, output=WORLDWIDE_TOTAL_PATH, projected_year=PROJECTED_YEAR,
+                         backcast='per_disease'):
+    """
+    Worldwide total as a DataFrame backed by the memory-mapped `.npy` artifact,
+    rebuilding it first if the source changed.
+    """
+    manifest = ensure_worldwide_total(source, output, projected_year, backcast)
+    values = np.load(output + '.npy', mmap_mode='r')
+    total = pd.DataFrame(values, columns=manifest['columns'], copy=False)
+    total['Year'] = total['Year'].astype(int)
+    return total
+
+
+def projection_arrays(world_data, projected_year=PROJECTED_YEAR, forecaster=None, backcast='per_disease'):
+    """
+    Projected economic burden and prevalence of every world data row.
+
+    Returns:
+        dict: 'years' (years,), 'economic_burden' and 'prevalence' (prevalence
+        in %) arrays of shape (world data rows, years).
+    """
+    model = ProjectionModel()
+    economic_panel = model.project_all_countries(world_data, projected_year, 'economic_burden', forecaster, backcast)
+    prevalence_panel = model.project_all_countries(world_data, projected_year, 'prevalence', forecaster)
+    years = economic_panel['Year'].unique()
+
+    return {
+        'years': years,
+        'economic_burden': economic_panel['Economic Burden ($)'].to_numpy().reshape(len(world_data), len(years)),
+        'prevalence': prevalence_panel['Prevalence (%)'].to_numpy().reshape(len(world_data), len(years)),
+    }
+
+
+def world_data_version(world_data):
+    """SHA-256 of the world data's contents, which keys everything derived from it."""
+    return hashlib.sha256(pd.util.hash_pandas_object(world_data.frame, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def ensure_projection_arrays(world_data, projected_year=PROJECTED_YEAR, forecaster=None, backcast='per_disease'):
+    """
+    `projection_arrays` memory-mapped read-only from `data_store/`, built and
+    published by the first process that needs them. They are keyed on the
+    world data's contents and the projection settings.
+    """
+    key = {
+        'world_data': world_data_version(world_data),
+        'projected_year': projected_year,
+        'forecaster': forecaster or DEFAULT_FORECASTER,
+        'backcast': backcast,
+    }
+    return shared_arrays(PROJECTION_ARRAYS, key,
+                         lambda: projection_arrays(world_data, projected_year, forecaster, backcast))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default=WORLD_DATA_PATH)
+    parser.add_argument('--force', action='store_true', help='rebuild even if the source hash is unchanged')
+    parser.add_argument('--backcast', choices=BACKCAST_MODES, default='per_disease',
+                        help="economic burden back-cast; 'shared' reproduces the original projection")
+    args = parser.parse_args()
+
+    for name, entry in ingest(force=args.force).items():
+        print(f"data_store/{name}: source {entry['source_sha256'][:12]}")
+
+    manifest = ensure_worldwide_total(args.source, backcast=args.backcast, force=args.force)
+    print(f"{WORLDWIDE_TOTAL_PATH}: source {manifest['source_sha256'][:12]}, data {manifest['sha256'][:12]}")
+
+    arrays = ensure_projection_arrays(WorldData.from_store(), backcast=args.backcast)
+    print(f"{PROJECTION_ARRAYS}: {', '.join(f'{name} {values.shape}' for name, values in arrays.items())}")
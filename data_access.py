@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from data_store import load_table
+
+
+class WorldData:
+    """
+    Indexed access to the world data, keyed on (Country, Disease).
+
+    The index is built once when the data loads, so fetching a row or the rows
+    of a country does not scan the whole DataFrame.
+    """
+
+    def __init__(self, df):
+        self.frame = df.reset_index(drop=True)
+
+        # (Country, Disease) -> row record; keep the first row like `.values[0]` did
+        self._records = {}
+        for record in self.frame.to_dict('records'):
+            self._records.setdefault((record['Country'], record['Disease']), record)
+
+        # Country -> row positions, in world data order
+        self._country_positions = self.frame.groupby('Country', sort=False).indices
+
+        # (country, disease) -> first row position, as a dense table over country
+        # and disease codes for vectorized lookups; -1 where the pair is missing
+        country_codes, countries = pd.factorize(self.frame['Country'].to_numpy(dtype=object))
+        disease_codes, diseases = pd.factorize(self.frame['Disease'].to_numpy(dtype=object))
+        self._country_codes = {country: code for code, country in enumerate(countries)}
+        self._disease_codes = {disease: code for code, disease in enumerate(diseases)}
+        first = ~self.frame.duplicated(['Country', 'Disease']).to_numpy()
+        self._pair_positions = np.full((len(countries), len(diseases)), -1)
+        self._pair_positions[country_codes[first], disease_codes[first]] = np.flatnonzero(first)
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+    @classmethod
+    def from_store(cls):
+        """World data memory-mapped from the typed columnar store."""
+        return cls(load_table('world_data'))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def countries(self):
+        """Countries in world data order."""
+        return list(self._country_positions)
+
+    def diseases(self, country):
+        """Diseases of a country in world data order."""
+        return self.country(country)['Disease'].unique()
+
+    def country(self, country):
+        """
+        Rows of a single country.
+
+        Args:
+            country (str): The country to fetch.
+
+        Returns:
+            pd.DataFrame: The country's rows (empty if the country is unknown).
+        """
+        return self.frame.iloc[self._country_positions.get(country, [])]
+
+    def row(self, country, disease):
+        """
+        Row of a single (country, disease) pair.
+
+        Args:
+            country (str): The country to fetch.
+            disease (str): The disease to fetch.
+
+        Returns:
+            dict: Column name -> value.
+
+        Raises:
+            KeyError: If the pair is not in the world data.
+        """
+        return self._records[(country, disease)]
+
+    def value(self, country, disease, column):
+        """Single value of a (country, disease) row."""
+        return self._records[(country, disease)][column]
+
+    def positions(self, countries, diseases):
+        """
+        Row positions of many (country, disease) pairs at once.
+
+        Args:
+            countries (array-like): Countries to fetch.
+            diseases (array-like): Diseases to fetch, aligned with countries.
+
+        Returns:
+            np.ndarray: Positions into `frame`.
+
+        Raises:
+            KeyError: If a pair is not in the world data.
+        """
+        country_codes = np.fromiter((self._country_codes.get(country, -1) for country in countries), np.intp, len(countries))
+        disease_codes = np.fromiter((self._disease_codes.get(disease, -1) for disease in diseases), np.intp, len(diseases))
+        positions = np.where((country_codes >= 0) & (disease_codes >= 0),
+                             self._pair_positions[country_codes, disease_codes], -1)
+        if (positions < 0).any():
+            missing = np.flatnonzero(positions < 0)[0]
+            raise KeyError(f"Unknown country and disease: {countries[missing]}, {diseases[missing]}")
+        return positions
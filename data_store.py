@@ -0,0 +1,303 @@
+"""
+Typed columnar store of the source CSVs used by the apps.
+
+Each table is ingested once from its CSV, with types normalized (e.g. `Year`
+and population counts as integers, province populations parsed from their
+quoted thousands separators), and written as an uncompressed Feather file
+under `data_store/`. Key columns are stored as categoricals, ratio strings
+like "0.85:1" as numbers, and numeric columns in the smallest dtype that holds
+their values exactly. Loading memory-maps the file, so workers share the page
+cache instead of parsing CSVs. A table is re-ingested when its CSV's SHA-256
+differs from the one recorded in `data_store/manifest.json`.
+
+Arrays derived from the tables (e.g. the projection index) are published the
+same way with `publish_arrays`, as `.npy` files that every worker attaches to
+read-only with `attach_arrays`.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+
+STORE_DIR = 'data_store'
+
+
+def _parse_provinces(df):
+    df['Population'] = df['Population'].fillna('0') \
+        .str.replace('"', '', regex=False).str.replace(',', '', regex=False).astype(int)
+    return df
+
+
+def parse_ratio(values):
+    """
+    Ratio strings such as "0.85:1" or "1.27 : 1" as left / right.
+
+    Raises:
+        ValueError: If a value is not two numbers separated by a colon.
+    """
+    parts = values.astype(str).str.strip().str.split(r'\s*:\s*', regex=True, expand=True)
+    if parts.shape[1] != 2:
+        raise ValueError(f"Not a ratio: {values[parts.notna().sum(axis=1) != 2].iloc[0]}")
+    return parts[0].astype(float) / parts[1].astype(float)
+
+
+def downcast(df):
+    """
+    Store integer and float columns in the smallest dtype that holds every
+    value exactly: integers by range, float64 as float32 only if it round-trips.
+    """
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_integer_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif values.dtype == np.float64:
+            as_float32 = values.to_numpy().astype(np.float32)
+            if np.array_equal(as_float32.astype(np.float64), values.to_numpy(), equal_nan=True):
+                df[column] = as_float32
+    return df
+
+
+# table -> source CSV, year index column (if any), integer, categorical and
+# ratio columns, and whether numeric columns are downcast
+TABLES = {
+    'world_data': {
+        'source': 'world_data_cleaned_new_2.csv',
+        'int_columns': ['Year', 'Population', 'Population 40+'],
+        'category_columns': ['Country', 'Disease'],
+        'ratio_columns': ['Undiagnosed : Diagnosed Ratio'],
+        'downcast': True,
+    },
+    'indonesia_prevalence': {
+        'source': 'indonesia_ncd_prevalence_cleaned.csv',
+        'index': 'Year',
+    },
+    'indonesia_economic_burden': {
+        'source': 'indonesia_ncd_economic_burden_cleaned.csv',
+        'index': 'Year',
+    },
+    'indonesia_economic_burden_undiagnosed': {
+        'source': 'indonesia_ncd_economic_burden_undiagnosed_cleaned.csv',
+        'index': 'Year',
+    },
+    'provinces': {
+        'source': 'provinces_population.csv',
+        'parse': _parse_provinces,
+    },
+}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write(path, write, mode='w'):
+    # write next to the target, then rename over it, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_source(name):
+    """
+    Read a table from its source CSV with normalized types.
+
+    Raises:
+        ValueError: If an integer column holds fractional values.
+    """
+    spec = TABLES[name]
+
+    if 'index' in spec:
+        df = pd.read_csv(spec['source'], index_col=0)
+        df.index = df.index.astype(int)
+        df = df.rename_axis(spec['index']).reset_index()
+    else:
+        df = pd.read_csv(spec['source'])
+
+    if 'parse' in spec:
+        df = spec['parse'](df)
+
+    for column in spec.get('int_columns', []):
+        if (df[column] % 1 != 0).any():
+            raise ValueError(f"{spec['source']}: column '{column}' is not integral")
+        df[column] = df[column].astype('int64')
+
+    for column in spec.get('ratio_columns', []):
+        df[column] = parse_ratio(df[column])
+
+    for column in spec.get('category_columns', []):
+        df[column] = df[column].astype('category')
+
+    if spec.get('downcast'):
+        df = downcast(df)
+
+    return df
+
+
+def _manifest_path(store_dir):
+    return os.path.join(store_dir, 'manifest.json')
+
+
+def _read_manifest(store_dir):
+    if not os.path.exists(_manifest_path(store_dir)):
+        return {}
+    with open(_manifest_path(store_dir)) as f:
+        return json.load(f)
+
+
+# manifest path -> (modification time, manifest) of the last read, for stored_version
+_manifest_cache = {}
+
+
+def stored_version(name, store_dir=STORE_DIR):
+    """
+    Source SHA-256 of a table as last ingested into the store, or None.
+
+    Cheap enough to poll on every request: the manifest is only re-read
+    when its modification time changes.
+    """
+    path = _manifest_path(store_dir)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _manifest_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _manifest_cache[path] = (mtime, _read_manifest(store_dir))
+    return cached[1].get(name, {}).get('source_sha256')
+
+
+def ingest(names=None, store_dir=STORE_DIR, force=False):
+    """
+    Write the tables whose source CSV changed (or all of them with `force`).
+
+    Returns:
+        dict: The manifest, table -> {'source', 'source_sha256'}.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _read_manifest(store_dir)
+
+    changed = False
+    for name in names or TABLES:
+        source = TABLES[name]['source']
+        source_hash = file_sha256(source)
+        table_path = os.path.join(store_dir, name + '.feather')
+
+        if not force and os.path.exists(table_path) and manifest.get(name, {}).get('source_sha256') == source_hash:
+            continue
+
+        df = read_source(name)
+        atomic_write(table_path, lambda f: feather.write_feather(df, f, compression='uncompressed'), mode='wb')
+        manifest[name] = {'source': source, 'source_sha256': source_hash}
+        changed = True
+
+    if changed:
+        # manifest last: it is only valid once the tables are in place
+        atomic_write(_manifest_path(store_dir), lambda f: json.dump(manifest, f, indent=2))
+
+    return manifest
+
+
+def publish_arrays(name, arrays, key, store_dir=STORE_DIR):
+    """
+    Write named arrays as `.npy` files that other processes attach to with
+    `attach_arrays`. The directory is named after the key's hash, so arrays
+    built from different inputs never overwrite each other.
+
+    Args:
+        name (str): Name of the array set.
+        arrays (dict): Array name -> np.ndarray.
+        key (dict): JSON-serializable description of what the arrays were built from.
+    """
+    directory = _arrays_dir(name, key, store_dir)
+    os.makedirs(directory, exist_ok=True)
+    for array_name, values in arrays.items():
+        atomic_write(os.path.join(directory, array_name + '.npy'), lambda f: np.save(f, values), mode='wb')
+    # manifest last: it is only valid once the arrays are in place
+    atomic_write(os.path.join(directory, 'manifest.json'),
+                 lambda f: json.dump({'key': key, 'arrays': list(arrays)}, f, indent=2))
+
+
+def attach_arrays(name, key, store_dir=STORE_DIR):
+    """
+    Read-only memory maps of arrays published with the same key, or None if
+    there are none yet. Every process attaching them shares the page cache.
+    """
+    directory = _arrays_dir(name, key, store_dir)
+    if not os.path.exists(os.path.join(directory, 'manifest.json')):
+        return None
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    return {array_name: np.load(os.path.join(directory, array_name + '.npy'), mmap_mode='r')
+            for array_name in manifest['arrays']}
+
+
+def shared_arrays(name, key, build, store_dir=STORE_DIR):
+    """Attach the arrays of `key`, building and publishing them with `build()` first if needed."""
+    arrays = attach_arrays(name, key, store_dir)
+    if arrays is None:
+        publish_arrays(name, build(), key, store_dir)
+        arrays = attach_arrays(name, key, store_dir)
+    return arrays
+
+
+def _arrays_dir(name, key, store_dir):
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return os.path.join(store_dir, f'{name}-{digest}')
+
+
+def memory_report(name, store_dir=STORE_DIR):
+    """
+    Deep memory of a table per column, as parsed by a plain `pd.read_csv` of
+    its source and as loaded from the store. Every worker holds one copy.
+
+    Returns:
+        pd.DataFrame: Per column 'csv_dtype', 'csv_bytes', 'store_dtype' and
+        'store_bytes', plus a 'total' row.
+    """
+    spec = TABLES[name]
+    before = pd.read_csv(spec['source'], index_col=0 if 'index' in spec else None)
+    after = load_table(name, store_dir)
+    if 'index' in spec:
+        before = before.rename_axis(spec['index']).reset_index()
+        after = after.rename_axis(spec['index']).reset_index()
+
+    report = pd.DataFrame({
+        'csv_dtype': before.dtypes.astype(str),
+        'csv_bytes': before.memory_usage(deep=True, index=False),
+        'store_dtype': after.dtypes.astype(str),
+        'store_bytes': after.memory_usage(deep=True, index=False),
+    })
+    report.loc['total'] = ['', report['csv_bytes'].sum(), '', report['store_bytes'].sum()]
+    return report
+
+
+def load_table(name, store_dir=STORE_DIR):
+    """
+    Memory-map a table from the store, ingesting it first if its CSV changed.
+
+    Year-indexed tables come back with the years as an (unnamed) index, like
+    `pd.read_csv(..., index_col=0)`.
+    """
+    ingest([name], store_dir)
+
+    table = feather.read_table(os.path.join(store_dir, name + '.feather'), memory_map=True)
+    df = table.to_pandas(split_blocks=True)
+
+    if 'index' in TABLES[name]:
+        df = df.set_index(TABLES[name]['index']).rename_axis(None)
+    return df
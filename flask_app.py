@@ -1,8 +1,20 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 import pandas as pd
 import json
+import math
 import numpy as np
-from model import Model
+from types import MappingProxyType
+from data_access import WorldData
+from build_artifacts import ensure_projection_arrays, projection_arrays, world_data_version
+from data_store import ingest, load_table, stored_version
+from forecasting import DEFAULT_FORECASTER, get_forecaster
+from impact import intervention_capacity, intervention_impact, predict_baseline, worldwide_baseline, IMPACT_FIELDS, WORLDWIDE_GROWTH_RATE
+from optimizer import required_capacity, minimal_intervention
+from portfolio import allocate_capacity
+from response_cache import ResponseCache
+from rollout import clinic_schedule, simulate_rollout
+from sensitivity import one_at_a_time, sobol_indices
+from uncertainty import simulate, simulate_predict_chunk, simulate_worldwide_chunk, validate_seed, DEFAULT_PERCENTILES
 
 app = Flask(__name__)
 
@@ -11,171 +23,492 @@ with open("parameters.json") as f:
     CONFIG = json.load(f)
 
 # Load data
-prevalence_data = pd.read_csv("indonesia_ncd_prevalence_cleaned.csv", index_col=0)
-economic_burden_undiagnosed_data = pd.read_csv("indonesia_ncd_economic_burden_undiagnosed_cleaned.csv", index_col=0)
-provinces_data = pd.read_csv("provinces_population.csv")
-provinces_data["Population"] = provinces_data["Population"].fillna("0").str.replace('"', '', regex=False).str.replace(",", "", regex=False).astype(int)
+prevalence_data = load_table("indonesia_prevalence")
+economic_burden_undiagnosed_data = load_table("indonesia_economic_burden_undiagnosed")
+provinces_data = load_table("provinces")
 
 # Load data worldwide
 
-world_data = pd.read_csv('world_data_cleaned_new_2.csv')
+PROJECTED_YEAR = 2034
 
-# Model instance (only for pictogram use later if extended)
-model = Model()
+# economic burden back-cast of the projections, see ProjectionModel.transform_country_disease_new
+BACKCAST = CONFIG.get("backcast", "per_disease")
 
-@app.route("/predict", methods=["POST"])
-def predict():
-    data = request.json
+# source hash of the world data in the store when it was loaded, see follow_store; read
+# first, so data ingested while loading is picked up on the next request
+world_data_source = stored_version('world_data')
+world_data = WorldData.from_store()
+# keys the response cache, which is cleared when /rebuild_worldwide swaps in other data
+data_version = world_data_version(world_data)
 
-    disease = data["disease"]
-    province = data["province"]
-    year = int(data["year"])
-    clinics = int(data["clinics"])
-    providers = int(data["providers"])
-    capacity_pct = float(data["capacity_pct"])
 
-    # Config values
+def build_projection_index(df, projected_year=PROJECTED_YEAR, forecaster=None):
+    """
+    Precompute the economic burden and prevalence projections of every country.
+
+    With "shared_projections" on (the default), the arrays are memory-mapped
+    from data_store/ (see build_artifacts.ensure_projection_arrays), so every
+    worker shares one copy; otherwise each process builds its own.
+
+    Args:
+        df (WorldData): Indexed world data.
+        projected_year (int): The year to extend to.
+        forecaster (str): Name in forecasting.FORECASTERS; the quadratic
+            increment if None.
+
+    Returns:
+        MappingProxyType: Read-only mapping with
+        - 'countries': country -> its world data 'rows' and 'diseases'
+          (disease -> position among the rows), in world data order.
+        - 'years': projected years, and 'year_keys' as strings.
+        - 'economic_burden': (world data rows, years) array of projected
+          economic burden, for vectorized lookups.
+        - 'prevalence': (world data rows, years) array of projected
+          prevalence (%).
+    """
+    if CONFIG.get("shared_projections", True):
+        arrays = ensure_projection_arrays(df, projected_year, forecaster, BACKCAST)
+    else:
+        arrays = projection_arrays(df, projected_year, forecaster, BACKCAST)
+
+    countries = {
+        country: MappingProxyType({
+            'rows': df.country(country).index.to_numpy(),
+            'diseases': {disease: position for position, disease in enumerate(df.diseases(country))},
+        })
+        for country in df.countries()
+    }
+
+    return MappingProxyType({
+        'countries': MappingProxyType(countries),
+        'years': arrays['years'],
+        'year_keys': [str(year) for year in arrays['years'].tolist()],
+        'economic_burden': arrays['economic_burden'],
+        'prevalence': arrays['prevalence'],
+    })
+
+
+def country_datasets(index, country, disease):
+    """
+    JSON-ready chart datasets of a (country, disease), years as string keys
+    as they are serialized.
+
+    Returns:
+        dict: 'combined_dataset' (the disease's 'economic_chart' and
+        'prevalence_chart') and 'economic_burden_all_disease'.
+    """
+    projection = index['countries'][country]
+    rows = projection['rows']
+    economic_burden = index['economic_burden'][rows]
+    position = projection['diseases'][disease]
+
+    # diseases summed in world data order, as the per-country projection does
+    return {
+        'combined_dataset': {
+            'economic_chart': dict(zip(index['year_keys'], economic_burden[position].tolist())),
+            'prevalence_chart': dict(zip(index['year_keys'], index['prevalence'][rows[position]].tolist())),
+        },
+        'economic_burden_all_disease': dict(zip(index['year_keys'], economic_burden.sum(axis=0).tolist())),
+    }
+
+
+projection_index = build_projection_index(world_data)
+
+# projection indexes of the other forecasters, built on first request
+forecaster_indexes = {}
+
+
+def get_projection_index(forecaster=None):
+    """
+    Projection index of a forecaster (see build_projection_index).
+
+    Raises:
+        ValueError: If the forecaster is not registered.
+    """
+    name = get_forecaster(forecaster).name
+    if name == DEFAULT_FORECASTER:
+        return projection_index
+    if name not in forecaster_indexes:
+        forecaster_indexes[name] = build_projection_index(world_data, forecaster=name)
+    return forecaster_indexes[name]
+
+
+# Output fields of /predict, in response order
+PREDICT_FIELDS = [
+    "population", "susceptible_population", "susceptible_diagnosed", "susceptible_undiagnosed",
+    "economic_burden", "economic_burden_per_capita",
+] + IMPACT_FIELDS
+PCT_FIELDS = {"pct_undiag_before", "pct_undiag_after", "capacity_pct"}
+SCENARIO_FIELDS = ["disease", "province", "year", "clinics", "providers", "capacity_pct"]
+FIELD_TYPES = {
+    "country": object, "disease": object, "province": object,
+    "year": int, "clinics": int, "providers": int, "capacity_pct": float,
+}
+
+
+ALL_PROVINCES = "Indonesia (All Provinces)"
+
+# Fields of /predict that depend only on (province, disease, year)
+CUBE_FIELDS = PREDICT_FIELDS[:6]
+
+
+def build_predict_cube():
+    """
+    Precompute the /predict baseline of every province, disease and year.
+
+    Returns:
+        MappingProxyType: 'provinces', 'diseases' and 'years' (pd.Index axes),
+        the inputs of the formulas ('undiagnosed_ratio' per disease,
+        'province_population' per province, 'prevalence_pct' and
+        'burden_unit_cost' per disease and year) and 'values', a read-only
+        array of shape (province, disease, year, field) in CUBE_FIELDS order.
+    """
     old_ratio = CONFIG["old_ratio"]
     old_population_all = CONFIG["old_population_all"]
     growth_rate = CONFIG["growth_rate"]
-    capacity_yearly = CONFIG["capacity_yearly"]
-    undiagnosed_ratio = CONFIG["undiagnosed_ratio"][disease]
-    
-    
 
-    # Population
-    if province == "Indonesia (All Provinces)":
-        old_population = old_population_all
-    else:
-        old_population = provinces_data[provinces_data["Province"] == province]["Population"].values[0] * old_ratio
+    diseases = prevalence_data.columns
+    years = prevalence_data.index
+    undiagnosed_ratio = np.array([CONFIG["undiagnosed_ratio"][d] for d in diseases])
 
-    # Compute projected population
-    projected_pop = old_population * (1 + growth_rate * (year - 2024))
-    prevalence_pct = prevalence_data[disease].loc[year]
-    susceptible_population = projected_pop * prevalence_pct / 100
+    # Population (first matching province, like .values[0]); "All Provinces" comes first
+    province_population = provinces_data.drop_duplicates("Province").set_index("Province")["Population"]
+    province_population = province_population[province_population.index != ALL_PROVINCES]
+    provinces = pd.Index([ALL_PROVINCES]).append(province_population.index)
+    # Population 40+ of each province before old_ratio; NaN for "All Provinces", which uses old_population_all
+    province_population = np.concatenate([[np.nan], province_population.to_numpy()])
+    old_population = np.where(provinces == ALL_PROVINCES, old_population_all, province_population * old_ratio)
 
-    # National baseline
-    projected_pop_all = old_population_all * (1 + growth_rate * (year - 2024))
-    susceptible_all = projected_pop_all * prevalence_pct / 100
+    # axes (province, disease, year)
+    prevalence_pct = prevalence_data.to_numpy().T
+    burden_unit_cost = economic_burden_undiagnosed_data[diseases].reindex(years).to_numpy().T
+    baseline = predict_baseline(old_population[:, None, None], old_population_all, growth_rate,
+                                years.to_numpy()[None, None, :], prevalence_pct[None], burden_unit_cost[None],
+                                undiagnosed_ratio[None, :, None])
+
+    values = np.stack(np.broadcast_arrays(*(baseline[field] for field in CUBE_FIELDS)), axis=-1)
+    values.flags.writeable = False
+
+    return MappingProxyType({
+        'provinces': provinces,
+        'diseases': diseases,
+        'years': years,
+        'undiagnosed_ratio': undiagnosed_ratio,
+        'province_population': province_population,
+        'prevalence_pct': prevalence_pct,
+        'burden_unit_cost': burden_unit_cost,
+        'values': values,
+    })
+
+
+predict_cube = build_predict_cube()
+
+
+def predict_baseline_arrays(disease, province, year):
+    """
+    Burden before any intervention of many /predict scenarios, looked up in `predict_cube`.
+
+    Args:
+        disease, province (np.ndarray): Disease and province names.
+        year (np.ndarray): Selected years.
+
+    Returns:
+        dict: CUBE_FIELDS -> unrounded np.ndarray, plus 'undiagnosed_ratio'.
+
+    Raises:
+        ValueError: If a disease, province or year is not in the data.
+    """
+    cube = predict_cube
+
+    disease_idx = cube['diseases'].get_indexer(disease)
+    year_idx = cube['years'].get_indexer(year)
+    province_idx = cube['provinces'].get_indexer(province)
+    if (disease_idx < 0).any():
+        raise ValueError(f"Unknown disease: {disease[disease_idx < 0][0]}")
+    if (year_idx < 0).any():
+        raise ValueError(f"Unknown year: {year[year_idx < 0][0]}")
+    if (province_idx < 0).any():
+        raise ValueError(f"Unknown province: {province[province_idx < 0][0]}")
+
+    return {
+        **dict(zip(CUBE_FIELDS, np.moveaxis(cube['values'][province_idx, disease_idx, year_idx], -1, 0))),
+        "undiagnosed_ratio": cube['undiagnosed_ratio'][disease_idx],
+    }
 
-    # Economic burden
-    burden_unit_cost = economic_burden_undiagnosed_data[disease].loc[year]
-    economic_burden = burden_unit_cost * (susceptible_population / susceptible_all)
-    
 
+def predict_arrays(disease, province, year, clinics, providers, capacity_pct):
+    """
+    Vectorized form of the /predict formulas for many scenarios at once.
 
-    # Split population
-    diagnosed = susceptible_population * (1 - undiagnosed_ratio)
-    undiagnosed = susceptible_population * undiagnosed_ratio
-    econ_burden_per_capita = economic_burden / undiagnosed if undiagnosed > 0 else 0
+    The baseline fields are looked up in `predict_cube`; only the intervention
+    is computed per call.
+
+    Args:
+        disease, province (np.ndarray): Disease and province names.
+        year, clinics, providers, capacity_pct (np.ndarray): Numeric inputs.
+
+    Returns:
+        dict: Field name -> unrounded np.ndarray, in PREDICT_FIELDS order.
+
+    Raises:
+        ValueError: If a disease, province or year is not in the data.
+    """
+    baseline = predict_baseline_arrays(disease, province, year)
+    undiagnosed_ratio = baseline.pop("undiagnosed_ratio")
 
     # Intervention calculation
-    intervention_capacity = capacity_yearly * clinics * providers * capacity_pct / 100 / 20
-    pct_undiag_before = undiagnosed_ratio * 100
-    pct_undiag_after = max(0, pct_undiag_before * (1 - (intervention_capacity / undiagnosed))) if undiagnosed > 0 else 0
+    impact = intervention_impact(CONFIG["capacity_yearly"], clinics, providers, capacity_pct,
+                                 baseline["susceptible_undiagnosed"], undiagnosed_ratio, baseline["economic_burden"])
 
-    economic_burden_after = max(0, economic_burden * (1 - intervention_capacity / undiagnosed)) if undiagnosed > 0 else 0
-    economic_burden_delta = economic_burden - economic_burden_after
+    return {**baseline, **impact}
 
-    return jsonify({
-        "population": round(projected_pop),
-        "susceptible_population": round(susceptible_population),
-        "susceptible_diagnosed": round(diagnosed),
-        "susceptible_undiagnosed": round(undiagnosed),
-        "economic_burden": round(economic_burden),
-        "economic_burden_per_capita": round(econ_burden_per_capita),
-        "intervention_capacity": round(intervention_capacity),
-        "pct_undiag_before": round(pct_undiag_before, 2),
-        "pct_undiag_after": round(pct_undiag_after, 2),
-        "economic_burden_after": round(economic_burden_after),
-        "economic_burden_delta": round(economic_burden_delta)
-    })
 
+def batch_scenarios(data, fields=SCENARIO_FIELDS):
+    """
+    Parse a batch body into scenario columns.
 
-@app.route("/predict_worldwide", methods=["POST"])
-def predict_worldwide():
-    data = request.json
+    The body holds either "scenarios", a list of single-scenario payloads, or
+    "grid", a mapping of every scenario field to a value or list of values
+    whose cartesian product is evaluated.
 
-    default_year = 2024  # <-- Add this line
+    Args:
+        data (dict): Request body.
+        fields (list): Scenario fields to read, typed with FIELD_TYPES.
 
-    selected_country = data["country"]
-    selected_disease = data["disease"]
-    select_year = data["year"]
-    
-    
-    
-    # graph codes
-    economic_burden = model.transform_country_disease_new(world_data, selected_country)
-    economic_burden_transformed = model.extend_years_quadratic_increment(economic_burden, 2034)
+    Returns:
+        dict: Scenario field -> np.ndarray.
 
-    prevalence_data = model.transform_country_disease_prevalence_new(world_data, selected_country)
-    prevalence_data_transformed = model.extend_years_quadratic_increment(prevalence_data, 2034)
+    Raises:
+        ValueError: If there are more scenarios than "batch.max_scenarios".
+    """
+    max_scenarios = int(CONFIG.get("batch", {}).get("max_scenarios", 100000))
+    if "grid" in data:
+        axes = [np.atleast_1d(np.asarray(data["grid"][field])) for field in fields]
+        # the size of the product is known before anything is expanded
+        count = math.prod(len(axis) for axis in axes)
+        if count > max_scenarios:
+            raise ValueError(f"The grid holds {count} scenarios, more than max_scenarios ({max_scenarios})")
+        positions = np.meshgrid(*[np.arange(len(axis)) for axis in axes], indexing="ij")
+        columns = {field: axis[pos.ravel()] for field, axis, pos in zip(fields, axes, positions)}
+    else:
+        scenarios = data["scenarios"]
+        if len(scenarios) > max_scenarios:
+            raise ValueError(f"{len(scenarios)} scenarios, more than max_scenarios ({max_scenarios})")
+        columns = {field: np.array([scenario[field] for scenario in scenarios]) for field in fields}
 
-    # slice prevalence_data_transformed so that it only contain column of selected_disease
-    prevalence_data_transformed_sliced = prevalence_data_transformed[[selected_disease]]
-    economic_burden_transformed_sliced = economic_burden_transformed[[selected_disease]]
-    
-    economic_burden_transformed_aggregated = economic_burden_transformed.sum(axis=1)
+    return {field: values.astype(FIELD_TYPES[field]) for field, values in columns.items()}
 
 
-    # convert prevalence_data_transformed_sliced so that it can be send as payload to flask requests
-    prevalence_data_transformed_sliced = prevalence_data_transformed_sliced.to_dict()
-    economic_burden_transformed_sliced = economic_burden_transformed_sliced.to_dict()
-    
-    economic_burden_transformed_sliced['economic_chart'] = economic_burden_transformed_sliced.pop(selected_disease)
-    prevalence_data_transformed_sliced['prevalence_chart'] = prevalence_data_transformed_sliced.pop(selected_disease)
-    
-    economic_burden_transformed_sliced.update(prevalence_data_transformed_sliced)
-    
-    
-    # economic_burden_transformed = economic_burden_transformed.to_dict()
-    
-    
+def batch_columns(scenarios, results):
+    """Batch inputs and rounded results as (inputs, outputs) lists per field."""
+    return {field: values.tolist() for field, values in scenarios.items()}, round_predict_columns(results)
 
-    selected_dataframe = world_data[(world_data['Country'] == selected_country) & (world_data['Disease'] == selected_disease)]
 
-    # print(selected_dataframe.to_string())
+def batch_response(data, scenarios, results):
+    """
+    Serialize batch inputs and results as NDJSON (default) or, with
+    "format": "columnar", one JSON object holding a list per field.
+    """
+    inputs, outputs = batch_columns(scenarios, results)
 
-    # population = selected_dataframe['Population'].values[0]
-    old_population_all = selected_dataframe['Population 40+'].values[0] 
-    economic_burden_selected = economic_burden_transformed[selected_disease].loc[select_year]
-    prevalence_selected = selected_dataframe['Prevalence % 40+'].values[0]
+    if data.get("format", "ndjson") == "columnar":
+        return jsonify({"count": len(next(iter(inputs.values()))), **inputs, **outputs})
 
+    def generate_rows():
+        fields = list(inputs) + list(outputs)
+        for row in zip(*inputs.values(), *outputs.values()):
+            yield json.dumps(dict(zip(fields, row))) + "\n"
 
-    susceptible_population_multiple = (old_population_all + (old_population_all * 0.01 * (select_year - default_year))) * prevalence_selected 
+    return Response(stream_with_context(generate_rows()), mimetype="application/x-ndjson")
 
 
-    select_year_old_population = old_population_all + (old_population_all * 0.01 * (select_year - 2024))
-    susceptible_population = select_year_old_population * prevalence_selected
-    # NOTE: Economic Burden below only for the undiagnosed
-    economic_burden = economic_burden_selected * (susceptible_population / susceptible_population_multiple)
+def round_predict_columns(results):
+    # same rounding as /predict: whole numbers, percentages to 2 decimals; flags as they are
+    return {
+        field: values.tolist() if values.dtype == bool
+        else [round(v, 2) for v in values.tolist()] if field in PCT_FIELDS
+        else np.rint(values).astype(np.int64).tolist()
+        for field, values in results.items()
+    }
 
-    # undiagnosed ratio is values of row in selected_dataframe given selected_disease and selected_country, extract values[0]
-    undiagnosed_ratio = selected_dataframe['% Undiagnosed Susceptible Population 40+'].values[0]
-    
 
+# bodies of the deterministic endpoints, see response_cache
+response_cache = ResponseCache.from_config(CONFIG)
 
-    susceptible_population_diagnosed = susceptible_population * (1 - undiagnosed_ratio)
-    susceptible_population_undiagnosed = susceptible_population * undiagnosed_ratio
 
-    economic_burden_per_capita = economic_burden / susceptible_population
+def json_object(data):
+    """
+    The request body, which must be a JSON object.
 
-    return jsonify({
-        "population": round(select_year_old_population),
-        "susceptible_population": round(susceptible_population),
-        "susceptible_population_diagnosed": round(susceptible_population_diagnosed),
-        "susceptible_population_undiagnosed": round(susceptible_population_undiagnosed),
-        "economic_burden": round(economic_burden),
-        "economic_burden_per_capita": round(economic_burden_per_capita),
+    Raises:
+        ValueError: For any other JSON value (null, a list, a number...).
+    """
+    if not isinstance(data, dict):
+        raise ValueError("The request body must be a JSON object")
+    return data
+
+
+def cached_json(compute):
+    """
+    `jsonify(compute(request.json))`, except that the encoded body is cached
+    per request body and data version: a repeated request is answered with
+    the stored bytes without computing or encoding anything.
+    """
+    body = response_cache.get_or_encode(request.path, json_object(request.json), data_version, compute,
+                                        lambda result: app.json.response(result).get_data())
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify(response_cache.stats())
+
+
+def compute_predict(data):
+    # single /predict scenario through the batch path
+    scenario = batch_scenarios({"scenarios": [data]})
+    results = predict_arrays(**scenario)
+    return {field: values[0] for field, values in round_predict_columns(results).items()}
+
+
+@app.route("/predict", methods=["POST"])
+def predict():
+    try:
+        return cached_json(compute_predict)
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@app.route("/predict/batch", methods=["POST"])
+def predict_batch():
+    try:
+        data = json_object(request.json)
+        scenarios = batch_scenarios(data)
+        results = predict_arrays(**scenarios)
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return batch_response(data, scenarios, results)
+
+
+# Output fields of /predict_worldwide (besides the chart datasets) and /scenario_worldwide
+WORLDWIDE_FIELDS = [
+    "population", "susceptible_population", "susceptible_population_diagnosed",
+    "susceptible_population_undiagnosed", "economic_burden", "economic_burden_per_capita",
+]
+WORLDWIDE_SCENARIO_FIELDS = ["country", "disease", "year", "clinics", "providers", "capacity_pct"]
+
+
+def predict_worldwide_arrays(country, disease, year, forecaster=None):
+    """
+    Vectorized form of the /predict_worldwide formulas for many scenarios at once.
+
+    Args:
+        country, disease (np.ndarray): Country and disease names.
+        year (np.ndarray): Selected years.
+        forecaster (str): Forecaster of the economic burden projection.
+
+    Returns:
+        dict: WORLDWIDE_FIELDS -> unrounded np.ndarray, plus 'undiagnosed_ratio'.
+
+    Raises:
+        KeyError: If a (country, disease) pair is not in the world data.
+        ValueError: If a year is outside the projection.
+    """
+    index = get_projection_index(forecaster)
+    rows = world_data.positions(country, disease)
+    year_idx = year - index['years'][0]
+    if ((year_idx < 0) | (year_idx >= len(index['years']))).any():
+        raise ValueError(f"Unknown year: {year[(year_idx < 0) | (year_idx >= len(index['years']))][0]}")
+
+    old_population_all = world_data.frame['Population 40+'].to_numpy()[rows]
+    economic_burden_selected = index['economic_burden'][rows, year_idx]
+    prevalence_selected = world_data.frame['Prevalence % 40+'].to_numpy()[rows]
+
+    # undiagnosed ratio of the selected country and disease row
+    undiagnosed_ratio = world_data.frame['% Undiagnosed Susceptible Population 40+'].to_numpy()[rows]
+
+    return {
+        **worldwide_baseline(old_population_all, prevalence_selected, economic_burden_selected, year, undiagnosed_ratio),
+        "undiagnosed_ratio": undiagnosed_ratio,
+    }
+
+
+def scenario_worldwide_arrays(country, disease, year, clinics, providers, capacity_pct, forecaster=None):
+    """
+    Burden and intervention impact in one pass: /predict_worldwide followed by
+    /impact_worldwide, without rounding the undiagnosed population and economic
+    burden in between.
+
+    Returns:
+        dict: WORLDWIDE_FIELDS and IMPACT_FIELDS -> unrounded np.ndarray.
+    """
+    burden = predict_worldwide_arrays(country, disease, year, forecaster)
+    undiagnosed_ratio = burden.pop("undiagnosed_ratio")
+
+    impact = intervention_impact(CONFIG["capacity_yearly"], clinics, providers, capacity_pct,
+                                 burden["susceptible_population_undiagnosed"], undiagnosed_ratio, burden["economic_burden"])
+
+    return {**burden, **impact}
+
+
+def compute_predict_worldwide(data):
+    selected_country = data["country"]
+    selected_disease = data["disease"]
+
+    scenario = batch_scenarios({"scenarios": [data]}, ["country", "disease", "year"])
+    results = predict_worldwide_arrays(**scenario, forecaster=data.get("forecaster"))
+    results.pop("undiagnosed_ratio")
+
+    return {
+        **{field: values[0] for field, values in round_predict_columns(results).items()},
         # "prevalence_dataset": prevalence_data_transformed_sliced,
-        "combined_dataset": economic_burden_transformed_sliced,
-        "economic_burden_all_disease": economic_burden_transformed_aggregated.to_dict(),
-    })
+        **country_datasets(get_projection_index(data.get("forecaster")), selected_country, selected_disease),
+    }
 
-@app.route("/impact_worldwide", methods=["POST"])
-def impact_worldwide():
-    data = request.json
 
+@app.route("/predict_worldwide", methods=["POST"])
+def predict_worldwide():
+    try:
+        return cached_json(compute_predict_worldwide)
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def compute_scenario_worldwide(data):
+    selected_country = data["country"]
+    selected_disease = data["disease"]
+
+    scenario = batch_scenarios({"scenarios": [data]}, WORLDWIDE_SCENARIO_FIELDS)
+    results = scenario_worldwide_arrays(**scenario, forecaster=data.get("forecaster"))
+
+    return {
+        **{field: values[0] for field, values in round_predict_columns(results).items()},
+        **country_datasets(get_projection_index(data.get("forecaster")), selected_country, selected_disease),
+    }
+
+
+@app.route("/scenario_worldwide", methods=["POST"])
+def scenario_worldwide():
+    try:
+        return cached_json(compute_scenario_worldwide)
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@app.route("/scenario_worldwide/batch", methods=["POST"])
+def scenario_worldwide_batch():
+    try:
+        data = json_object(request.json)
+        scenarios = batch_scenarios(data, WORLDWIDE_SCENARIO_FIELDS)
+        results = scenario_worldwide_arrays(**scenarios, forecaster=data.get("forecaster"))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return batch_response(data, scenarios, results)
+
+
+def compute_impact_worldwide(data):
     country = data['country']
     disease = data['disease']
     clinics = data["clinic_count"]
@@ -187,25 +520,602 @@ def impact_worldwide():
     economic_burden = data['economic_burden']
 
     # get undiagnosed_ratio from world_data dataset in row where in column of '% Undiagnosed Susceptible Population 40+'
-    undiagnosed_ratio = world_data.loc[(world_data['Country'] == country) & (world_data['Disease'] == disease), '% Undiagnosed Susceptible Population 40+'].values[0]
+    undiagnosed_ratio = world_data.value(country, disease, '% Undiagnosed Susceptible Population 40+')
 
     
     # Intervention calculation
-    intervention_capacity = capacity_yearly * clinics * providers * capacity_pct / 100 / 20
-    pct_undiag_before = undiagnosed_ratio * 100
-    pct_undiag_after = max(0, pct_undiag_before * (1 - (intervention_capacity / undiagnosed))) if undiagnosed > 0 else 0
+    impact = intervention_impact(capacity_yearly, clinics, providers, capacity_pct, undiagnosed, undiagnosed_ratio, economic_burden)
+
+
+    return {
+        "intervention_capacity": round(impact["intervention_capacity"]),
+        "pct_undiag_before": round(impact["pct_undiag_before"], 2),
+        "pct_undiag_after": round(impact["pct_undiag_after"], 2),
+        "economic_burden_after": round(impact["economic_burden_after"]),
+        "economic_burden_delta": round(impact["economic_burden_delta"]),
+        "economic_burden": round(economic_burden),
+    }
+
+
+@app.route("/impact_worldwide", methods=["POST"])
+def impact_worldwide():
+    try:
+        return cached_json(compute_impact_worldwide)
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def requested_samples(data, settings, default, default_max):
+    """
+    Sample count of a request, the configured "samples" if it gives none.
+
+    Raises:
+        ValueError: Above the configured "max_samples", which bounds the
+            memory a single request can take.
+    """
+    samples = int(data.get("samples", settings.get("samples", default)))
+    max_samples = settings.get("max_samples", default_max)
+    if samples > max_samples:
+        raise ValueError(f"samples must be at most {max_samples}")
+    return samples
+
+
+def uncertainty_options(data):
+    # simulation settings of parameters.json, overridable per request (except the pool size)
+    settings = CONFIG.get("uncertainty", {})
+    if not isinstance(data.get("distributions", {}), dict):
+        raise ValueError("distributions must be an object: parameter -> distribution")
+    return {
+        "spec": {**settings.get("distributions", {}), **data.get("distributions", {})},
+        "samples": requested_samples(data, settings, 10000, 1000000),
+        "seed": data.get("seed"),
+        "processes": settings.get("processes"),
+        "percentiles": data.get("percentiles", settings.get("percentiles", DEFAULT_PERCENTILES)),
+    }
+
+
+def uncertainty_response(simulation):
+    return {
+        "samples": simulation["samples"],
+        "seed": simulation["seed"],
+        "bands": {
+            field: {name: round(value, 2) for name, value in band.items()}
+            for field, band in simulation["bands"].items()
+        },
+    }
+
+
+def predict_uncertainty_inputs(data):
+    """Point inputs of a /predict scenario for simulate_predict_chunk."""
+    scenario = {field: values[0] for field, values in batch_scenarios({"scenarios": [data]}).items()}
+
+    # validates the scenario like /predict
+    predict_arrays(**{field: np.array([value]) for field, value in scenario.items()})
+
+    cube = predict_cube
+    province_idx = cube['provinces'].get_loc(scenario["province"])
+    disease_idx = cube['diseases'].get_loc(scenario["disease"])
+    year_idx = cube['years'].get_loc(scenario["year"])
+
+    return {
+        "growth_rate": CONFIG["growth_rate"],
+        "old_ratio": CONFIG["old_ratio"],
+        "undiagnosed_ratio": cube['undiagnosed_ratio'][disease_idx],
+        "capacity_yearly": CONFIG["capacity_yearly"],
+        "province_population": None if scenario["province"] == ALL_PROVINCES else cube['province_population'][province_idx],
+        "old_population_all": CONFIG["old_population_all"],
+        "year": scenario["year"],
+        "prevalence_pct": cube['prevalence_pct'][disease_idx, year_idx],
+        "burden_unit_cost": cube['burden_unit_cost'][disease_idx, year_idx],
+        "clinics": scenario["clinics"],
+        "providers": scenario["providers"],
+        "capacity_pct": scenario["capacity_pct"],
+    }
+
+
+def compute_predict_uncertainty(data):
+    inputs = predict_uncertainty_inputs(data)
+    return uncertainty_response(simulate(simulate_predict_chunk, inputs, **uncertainty_options(data)))
+
+
+@app.route("/predict/uncertainty", methods=["POST"])
+def predict_uncertainty():
+    try:
+        result = compute_predict_uncertainty(json_object(request.json))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+
+def predict_worldwide_uncertainty_inputs(data):
+    """Point inputs of a /predict_worldwide scenario for simulate_worldwide_chunk."""
+    # the intervention fields are simulated too when the scenario has clinics
+    fields = WORLDWIDE_SCENARIO_FIELDS if "clinics" in data else ["country", "disease", "year"]
+    scenario = {field: values[0] for field, values in batch_scenarios({"scenarios": [data]}, fields).items()}
+
+    # validates the scenario like /predict_worldwide
+    predict_worldwide_arrays(*(np.array([scenario[field]]) for field in ["country", "disease", "year"]))
+
+    row = world_data.positions(np.array([scenario["country"]]), np.array([scenario["disease"]]))[0]
+    country_rows = world_data.country(scenario["country"])
+
+    return {
+        "economic_burden_growth": country_rows['Economic Burden Growth Yearly ($)'].to_numpy(dtype=float),
+        "undiagnosed_ratio": world_data.frame['% Undiagnosed Susceptible Population 40+'].iloc[row],
+        "capacity_yearly": CONFIG["capacity_yearly"],
+        "economic_burden": country_rows['Economic Burden ($)'].to_numpy(dtype=float),
+        "disease_position": country_rows.index.get_loc(row),
+        "year": scenario["year"],
+        "projected_year": PROJECTED_YEAR,
+        "backcast": BACKCAST,
+        "old_population_all": world_data.frame['Population 40+'].iloc[row],
+        "prevalence": world_data.frame['Prevalence % 40+'].iloc[row],
+        "clinics": scenario.get("clinics"),
+        "providers": scenario.get("providers"),
+        "capacity_pct": scenario.get("capacity_pct"),
+    }
+
+
+def compute_predict_worldwide_uncertainty(data):
+    inputs = predict_worldwide_uncertainty_inputs(data)
+    return uncertainty_response(simulate(simulate_worldwide_chunk, inputs, **uncertainty_options(data)))
+
+
+@app.route("/predict_worldwide/uncertainty", methods=["POST"])
+def predict_worldwide_uncertainty():
+    try:
+        result = compute_predict_worldwide_uncertainty(json_object(request.json))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+
+SENSITIVITY_INPUTS = ["clinics", "providers", "capacity_pct", "undiagnosed_ratio", "growth_rate"]
+SENSITIVITY_BOUNDS = {"capacity_pct": (0, 100), "undiagnosed_ratio": (0, 1)}
+
+
+def world_rows(data):
+    """
+    Positions of every (country, disease) of the world data, narrowed to the
+    body's "countries" and "diseases" lists if given.
+
+    Raises:
+        ValueError: If a listed country or disease is not in the world data.
+    """
+    frame = world_data.frame
+    keep = np.ones(len(frame), dtype=bool)
+    for field, column in (("countries", "Country"), ("diseases", "Disease")):
+        if field in data:
+            unknown = set(data[field]) - set(frame[column])
+            if unknown:
+                raise ValueError(f"Unknown {field}: {sorted(unknown)}")
+            keep &= frame[column].isin(data[field]).to_numpy()
+    return np.flatnonzero(keep & ~frame.duplicated(["Country", "Disease"]).to_numpy())
+
+
+def worldwide_burden_reduction(clinics, providers, capacity_pct, undiagnosed_ratio, growth_rate,
+                               old_population_all, prevalence, economic_burden, year):
+    """economic_burden_delta of /scenario_worldwide as a function of its inputs, broadcast like impact.py."""
+    burden = worldwide_baseline(old_population_all, prevalence, economic_burden, year, undiagnosed_ratio, growth_rate)
+    impact = intervention_impact(CONFIG["capacity_yearly"], clinics, providers, capacity_pct,
+                                 burden["susceptible_population_undiagnosed"], undiagnosed_ratio, burden["economic_burden"])
+    return impact["economic_burden_delta"]
+
+
+def compute_sensitivity(data):
+    settings = CONFIG.get("sensitivity", {})
+    if not isinstance(data.get("ranges", {}), dict):
+        raise ValueError("ranges must be an object: input -> [low, high]")
+    ranges = {**settings.get("ranges", {}), **data.get("ranges", {})}
+    for name, bounds in ranges.items():
+        if not (isinstance(bounds, list) and len(bounds) == 2 and all(isinstance(bound, (int, float)) for bound in bounds)):
+            raise ValueError(f"Range of {name} must be [low, high] multipliers, not {bounds!r}")
+    ranges = {name: tuple(bounds) for name, bounds in ranges.items()}
+    if set(ranges) - set(SENSITIVITY_INPUTS):
+        raise ValueError(f"Unknown sensitivity inputs: {sorted(set(ranges) - set(SENSITIVITY_INPUTS))}")
+    method = data.get("method", "both")
+    if method not in ("oat", "sobol", "both"):
+        raise ValueError(f"Unknown method: {method}")
+
+    frame = world_data.frame
+    rows = world_rows(data)
+    if not len(rows):
+        raise ValueError("No country and disease matches the countries and diseases given")
+
+    index = get_projection_index(data.get("forecaster"))
+    year = int(data["year"])
+    year_idx = year - index['years'][0]
+    if not 0 <= year_idx < len(index['years']):
+        raise ValueError(f"Unknown year: {year}")
+
+    n = len(rows)
+    base = {
+        "clinics": np.full(n, float(data["clinics"])),
+        "providers": np.full(n, float(data["providers"])),
+        "capacity_pct": np.full(n, float(data["capacity_pct"])),
+        "undiagnosed_ratio": frame['% Undiagnosed Susceptible Population 40+'].to_numpy()[rows],
+        "growth_rate": np.full(n, WORLDWIDE_GROWTH_RATE),
+        "old_population_all": frame['Population 40+'].to_numpy()[rows],
+        "prevalence": frame['Prevalence % 40+'].to_numpy()[rows],
+        "economic_burden": index['economic_burden'][rows, year_idx],
+        "year": year,
+    }
+
+    scenarios = [{"country": frame['Country'].iloc[row], "disease": frame['Disease'].iloc[row]} for row in rows]
+    summary = {name: {} for name in ranges}
+
+    oat = one_at_a_time(worldwide_burden_reduction, base, ranges, SENSITIVITY_BOUNDS)
+    for i, scenario in enumerate(scenarios):
+        scenario["economic_burden_delta"] = round(float(oat['base'][i]))
+
+    if method in ("oat", "both"):
+        for i, scenario in enumerate(scenarios):
+            scenario["one_at_a_time"] = {
+                name: {end: round(float(values[i])) for end, values in oat[name].items()} for name in ranges
+            }
+        for name in ranges:
+            summary[name]["mean_swing"] = round(float(oat[name]['swing'].mean()))
+
+    if method in ("sobol", "both"):
+        samples = requested_samples(data, settings, 1024, 16384)
+        validate_seed(data.get("seed"))
+        sobol = sobol_indices(worldwide_burden_reduction, base, ranges, samples, data.get("seed"), SENSITIVITY_BOUNDS)
+        for i, scenario in enumerate(scenarios):
+            scenario["sobol"] = {
+                name: {index: round(float(values[i]), 4) for index, values in sobol[name].items()} for name in ranges
+            }
+        for name in ranges:
+            summary[name]["mean_first_order"] = round(float(sobol[name]['first_order'].mean()), 4)
+            summary[name]["mean_total"] = round(float(sobol[name]['total'].mean()), 4)
+
+    # tornado order: most influential input first
+    key = "mean_total" if method != "oat" else "mean_swing"
+    ranking = sorted(ranges, key=lambda name: summary[name][key], reverse=True)
+
+    return {
+        "output": "economic_burden_delta",
+        "year": year,
+        "ranges": {name: list(ranges[name]) for name in ranking},
+        "ranking": ranking,
+        "summary": summary,
+        "scenarios": scenarios,
+    }
+
+
+@app.route("/sensitivity", methods=["POST"])
+def sensitivity():
+    try:
+        result = compute_sensitivity(json_object(request.json))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+
+# Solution fields of /optimize, besides the IMPACT_FIELDS it reaches
+OPTIMIZE_FIELDS = ["clinics", "providers", "capacity_pct", "required_capacity", "feasible"]
+OPTIMIZE_SETTINGS = ["target_pct_undiag_after", "target_burden_reduction", "clinics", "providers", "capacity_pct"]
+
 
-    economic_burden_after = max(0, economic_burden * (1 - intervention_capacity / undiagnosed)) if undiagnosed > 0 else 0
-    economic_burden_delta = economic_burden - economic_burden_after
+def optimize_arrays(disease, year, settings, province=None, country=None):
+    """
+    Smallest intervention reaching a target for many provinces (or countries) at once.
 
+    Args:
+        disease, year (np.ndarray): Diseases and years.
+        settings (dict): One target ("target_pct_undiag_after" or
+            "target_burden_reduction"), the fixed inputs among "clinics",
+            "providers" and "capacity_pct", and optionally "max_providers"
+            and the "forecaster" of the world projection.
+        province, country (np.ndarray): Provinces of Indonesia, or countries of the world data.
+
+    Returns:
+        dict: OPTIMIZE_FIELDS and the IMPACT_FIELDS of the solution -> np.ndarray.
+
+    Raises:
+        KeyError, ValueError: If a scenario is unknown or the settings are invalid.
+    """
+    if country is not None:
+        burden = predict_worldwide_arrays(country, disease, year, settings.get("forecaster"))
+        undiagnosed = burden["susceptible_population_undiagnosed"]
+        undiagnosed_ratio = burden["undiagnosed_ratio"]
+    else:
+        burden = predict_baseline_arrays(disease, province, year)
+        undiagnosed = burden["susceptible_undiagnosed"]
+        undiagnosed_ratio = burden["undiagnosed_ratio"]
+
+    fixed = {name: settings.get(name) for name in OPTIMIZE_SETTINGS}
+    required, reachable = required_capacity(undiagnosed, undiagnosed_ratio, burden["economic_burden"],
+                                            fixed.pop("target_pct_undiag_after"), fixed.pop("target_burden_reduction"))
+    solution = minimal_intervention(CONFIG["capacity_yearly"], required, max_providers=int(settings.get("max_providers", 10)), **fixed)
+
+    impact = intervention_impact(CONFIG["capacity_yearly"], solution["clinics"], solution["providers"], solution["capacity_pct"],
+                                 undiagnosed, undiagnosed_ratio, burden["economic_burden"])
+
+    return {
+        "clinics": solution["clinics"],
+        "providers": solution["providers"],
+        "capacity_pct": solution["capacity_pct"],
+        "required_capacity": required,
+        "feasible": reachable & solution["feasible"],
+        **impact,
+    }
+
+
+def optimize_fields(data):
+    # worldwide when the scenarios are countries, Indonesia's provinces otherwise
+    place = "country" if data.get("scope") == "worldwide" or "country" in data else "province"
+    return [place, "disease", "year"]
+
+
+def compute_optimize(data):
+    fields = optimize_fields(data)
+    scenario = batch_scenarios({"scenarios": [data]}, fields)
+    results = optimize_arrays(scenario["disease"], scenario["year"], data, **{fields[0]: scenario[fields[0]]})
+    return {field: values[0] for field, values in round_predict_columns(results).items()}
+
+
+@app.route("/optimize", methods=["POST"])
+def optimize():
+    try:
+        result = compute_optimize(json_object(request.json))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+
+@app.route("/optimize/batch", methods=["POST"])
+def optimize_batch():
+    try:
+        data = json_object(request.json)
+        fields = optimize_fields(data)
+        if "scenarios" in data or "grid" in data:
+            scenarios = batch_scenarios(data, fields)
+        elif fields[0] == "country":
+            # every (country, disease) of the world data
+            pairs = world_data.frame.drop_duplicates(["Country", "Disease"])
+            scenarios = batch_scenarios({"scenarios": [
+                {"country": country, "disease": disease, "year": data["year"]}
+                for country, disease in zip(pairs["Country"], pairs["Disease"])
+            ]}, fields)
+        else:
+            # every (province, disease)
+            scenarios = batch_scenarios({"grid": {
+                "province": list(predict_cube['provinces']), "disease": list(predict_cube['diseases']), "year": data["year"],
+            }}, fields)
+
+        results = optimize_arrays(scenarios["disease"], scenarios["year"], data, **{fields[0]: scenarios[fields[0]]})
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return batch_response(data, scenarios, results)
+
+
+ROLLOUT_FIELDS = ["undiagnosed_before", "newly_diagnosed", "diagnosed_stock", "undiagnosed_after",
+                  "economic_burden", "economic_burden_after", "burden_averted", "cumulative_burden_averted"]
+
+
+def compute_rollout(data):
+    index = get_projection_index(data.get("forecaster"))
+    years = index['years']
+    start_year = int(data.get("start_year", 2025))
+    end_year = int(data.get("end_year", PROJECTED_YEAR))
+    if not years[0] <= start_year <= end_year <= years[-1]:
+        raise ValueError(f"Years must be within {years[0]}-{years[-1]}: {start_year}-{end_year}")
+    span = slice(start_year - years[0], end_year - years[0] + 1)
+    years = years[span]
+
+    clinics = clinic_schedule(years, data.get("schedule"), data.get("ramp"))
+    capacity = intervention_capacity(clinics, data["providers"], data["capacity_pct"], CONFIG["capacity_yearly"])
+
+    # susceptible population of every selected (country, disease) and year, following the
+    # projected prevalence; the population 40+ grows as in worldwide_baseline
+    frame = world_data.frame
+    rows = world_rows(data)
+    population = frame['Population 40+'].to_numpy()[rows, None] * (1 + WORLDWIDE_GROWTH_RATE * (years - 2024))
+    susceptible = population * index['prevalence'][rows, span] / 100
+
+    # the projected burden is spread over the undiagnosed of the same projection
+    results = simulate_rollout(capacity, susceptible, frame['% Undiagnosed Susceptible Population 40+'].to_numpy()[rows],
+                               index['economic_burden'][rows, span])
+
+    scenarios = []
+    for i, row in enumerate(rows):
+        scenario = {
+            "country": frame['Country'].iloc[row],
+            "disease": frame['Disease'].iloc[row],
+            "cumulative_burden_averted": round(float(results['cumulative_burden_averted'][i, -1])),
+            "diagnosed_stock": round(float(results['diagnosed_stock'][i, -1])),
+        }
+        if data.get("yearly"):
+            scenario["yearly"] = {field: np.rint(results[field][i]).astype(np.int64).tolist() for field in ROLLOUT_FIELDS}
+        scenarios.append(scenario)
+
+    return {
+        "years": years.tolist(),
+        "clinics": clinics.astype(np.int64).tolist(),
+        "total": {
+            "cumulative_burden_averted": round(float(results['cumulative_burden_averted'][:, -1].sum())),
+            "burden_averted": np.rint(results['burden_averted'].sum(axis=0)).astype(np.int64).tolist(),
+            "diagnosed_stock": round(float(results['diagnosed_stock'][:, -1].sum())),
+        },
+        "scenarios": scenarios,
+    }
+
+
+@app.route("/rollout", methods=["POST"])
+def rollout():
+    try:
+        result = compute_rollout(json_object(request.json))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+
+def portfolio_scenarios(year, clinics, providers, countries=None, provinces=None, forecaster=None):
+    """
+    Best split of each fleet's capacity across the diseases of its country (or province).
+
+    Args:
+        year (int): Selected year.
+        clinics, providers (int): The fleet: clinics and providers per clinic.
+        countries (list): Countries of the world data.
+        provinces (list): Provinces of Indonesia, instead of countries.
+        forecaster (str): Forecaster of the world projection.
+
+    Returns:
+        list: Per country (or province), the 'allocation' per disease, the
+        total 'burden_averted', and the 'equal_split_burden_averted' and
+        'unused_capacity_pct' for comparison.
+
+    Raises:
+        KeyError, ValueError: If a scenario is unknown.
+    """
+    if provinces is not None:
+        place_field, places = "province", list(provinces)
+        diseases = list(predict_cube['diseases'])
+        province, disease = (axis.ravel() for axis in np.meshgrid(np.array(places, dtype=object), np.array(diseases, dtype=object), indexing="ij"))
+        burden = predict_baseline_arrays(disease, province, np.full(len(province), year))
+        undiagnosed = burden["susceptible_undiagnosed"].reshape(len(places), len(diseases))
+        economic_burden = burden["economic_burden"].reshape(len(places), len(diseases))
+        undiagnosed_ratio = burden["undiagnosed_ratio"].reshape(len(places), len(diseases))
+        names = np.broadcast_to(np.array(diseases, dtype=object), undiagnosed.shape)
+        present = np.ones(undiagnosed.shape, dtype=bool)
+    else:
+        place_field = "country"
+        rows = world_rows({"countries": countries} if countries is not None else {})
+        frame = world_data.frame.iloc[rows]
+        codes, places = pd.factorize(frame['Country'])
+        places = list(places)
+        slots = frame.groupby('Country', sort=False).cumcount().to_numpy()
+        burden = predict_worldwide_arrays(frame['Country'].to_numpy(dtype=object), frame['Disease'].to_numpy(dtype=object),
+                                          np.full(len(frame), year), forecaster)
+
+        # (country, disease slot) matrices, padded with empty diseases
+        shape = (len(places), slots.max() + 1 if len(slots) else 0)
+        undiagnosed, economic_burden, undiagnosed_ratio = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+        names, present = np.full(shape, None, dtype=object), np.zeros(shape, dtype=bool)
+        undiagnosed[codes, slots] = burden["susceptible_population_undiagnosed"]
+        economic_burden[codes, slots] = burden["economic_burden"]
+        undiagnosed_ratio[codes, slots] = burden["undiagnosed_ratio"]
+        names[codes, slots] = frame['Disease'].to_numpy()
+        present[codes, slots] = True
+
+    capacity_yearly = CONFIG["capacity_yearly"]
+    # the whole fleet, every provider's full capacity
+    total_capacity = np.full(len(places), intervention_capacity(clinics, providers, 100, capacity_yearly))
+
+    has_undiagnosed = undiagnosed > 0
+    burden_per_undiagnosed = np.where(has_undiagnosed, economic_burden / np.where(has_undiagnosed, undiagnosed, 1), 0)
+    allocation = allocate_capacity(total_capacity, undiagnosed, burden_per_undiagnosed)
+
+    has_capacity = total_capacity[:, None] > 0
+    capacity_pct = np.where(has_capacity, allocation / np.where(has_capacity, total_capacity[:, None], 1) * 100, 0)
+    impact = intervention_impact(capacity_yearly, clinics, providers, capacity_pct, undiagnosed, undiagnosed_ratio, economic_burden)
+
+    # baseline: the same fleet split evenly across the diseases
+    equal_pct = np.where(present, 100 / present.sum(axis=1, keepdims=True), 0)
+    equal = intervention_impact(capacity_yearly, clinics, providers, equal_pct, undiagnosed, undiagnosed_ratio, economic_burden)
+
+    scenarios = []
+    for i, place in enumerate(places):
+        slots_present = np.flatnonzero(present[i])
+        scenarios.append({
+            place_field: place,
+            "year": year,
+            "burden_averted": round(float(impact["economic_burden_delta"][i, slots_present].sum())),
+            "equal_split_burden_averted": round(float(equal["economic_burden_delta"][i, slots_present].sum())),
+            "unused_capacity_pct": round(max(0.0, 100 - float(capacity_pct[i].sum())), 2),
+            "allocation": {
+                names[i, j]: {
+                    "capacity_pct": round(float(capacity_pct[i, j]), 2),
+                    "economic_burden": round(float(economic_burden[i, j])),
+                    "economic_burden_delta": round(float(impact["economic_burden_delta"][i, j])),
+                    "pct_undiag_after": round(float(impact["pct_undiag_after"][i, j]), 2),
+                }
+                for j in slots_present
+            },
+        })
+    return scenarios
+
+
+def compute_portfolio(data):
+    if "province" in data:
+        places = {"provinces": [data["province"]]}
+    else:
+        places = {"countries": [data["country"]]}
+    return portfolio_scenarios(int(data["year"]), data["clinics"], data["providers"], **places,
+                               forecaster=data.get("forecaster"))[0]
+
+
+@app.route("/portfolio", methods=["POST"])
+def portfolio():
+    try:
+        result = compute_portfolio(json_object(request.json))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(result)
+
+
+@app.route("/portfolio/batch", methods=["POST"])
+def portfolio_batch():
+    # every country of the world data, or every province with "scope": "indonesia"
+    try:
+        data = json_object(request.json)
+        if data.get("scope") == "indonesia":
+            places = {"provinces": data.get("provinces", list(predict_cube['provinces']))}
+        else:
+            places = {"countries": data.get("countries")}
+        scenarios = portfolio_scenarios(int(data["year"]), data["clinics"], data["providers"], **places,
+                                        forecaster=data.get("forecaster"))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    if data.get("format", "ndjson") == "json":
+        return jsonify({"count": len(scenarios), "scenarios": scenarios})
+
+    return Response(stream_with_context(json.dumps(scenario) + "\n" for scenario in scenarios),
+                    mimetype="application/x-ndjson")
+
+
+def reload_world_data():
+    """Swap in the world data of the store and a freshly built projection index."""
+    global world_data, projection_index, forecaster_indexes, data_version, world_data_source
+
+    source = stored_version('world_data')
+    new_world_data = WorldData.from_store()
+    new_projection_index = build_projection_index(new_world_data)
+    # the other forecasters' indexes are rebuilt from the new data on their next request; the
+    # version goes last, so a response cached under it was computed from the new data
+    world_data, projection_index, forecaster_indexes, world_data_source, data_version = (
+        new_world_data, new_projection_index, {}, source, world_data_version(new_world_data))
+
+
+@app.before_request
+def follow_store():
+    """
+    Reload the world data when the store holds another version, so a
+    /rebuild_worldwide served by one worker reaches every worker on its
+    next request. A stat of the store manifest while nothing changed.
+    """
+    if stored_version('world_data') != world_data_source:
+        reload_world_data()
+
+
+@app.route("/rebuild_worldwide", methods=["POST"])
+def rebuild_worldwide():
+    # re-ingest the world data if its CSV changed; the other workers follow the store
+    ingest(['world_data'])
+    reload_world_data()
 
     return jsonify({
-        "intervention_capacity": round(intervention_capacity),
-        "pct_undiag_before": round(pct_undiag_before, 2),
-        "pct_undiag_after": round(pct_undiag_after, 2),
-        "economic_burden_after": round(economic_burden_after),
-        "economic_burden_delta": round(economic_burden_delta),
-        "economic_burden": round(economic_burden),
+        "countries": len(projection_index['countries']),
+        "projected_year": PROJECTED_YEAR,
     })
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""
+Forecasting models for the yearly prevalence and economic burden series.
+
+Every forecaster fits many series at once: `fit(years, values)` takes the
+observed years (n_years,) and a (n_series, n_years) array, and
+`predict(years)` returns (n_series, len(years)). Get one by name from the
+FORECASTERS registry with `get_forecaster`.
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Forecaster(ABC):
+    """Base of the registered forecasters; subclasses must implement fit and predict."""
+    name = None
+
+    @abstractmethod
+    def fit(self, years, values):
+        """Fit every row of `values` (n_series, n_years) against `years`; returns self."""
+
+    @abstractmethod
+    def predict(self, years):
+        """Forecast of every series at `years`, (n_series, len(years))."""
+
+
+def _ols(x, y):
+    # least-squares line of every row of y against x
+    x_mean = x.mean()
+    y_mean = y.mean(axis=1)
+    slope = ((x - x_mean) * (y - y_mean[:, None])).mean(axis=1) / ((x - x_mean) ** 2).mean()
+    return y_mean - slope * x_mean, slope
+
+
+def quadratic_increment_matrix(pairs, year_start, year_end, projected_year):
+    """
+    Vectorized form of `ProjectionModel.extend_years_quadratic_increment` for many series at once.
+    Quadratic fill between year_start and year_end, then linear tail using the
+    average annual increment of the span.
+
+    Args:
+        pairs (array-like): (n_series, 2) array of (start, end) values.
+        year_start (int): Year of the start values.
+        year_end (int): Year of the end values.
+        projected_year (int): The year to extend to.
+
+    Returns:
+        tuple: (years, values) where years is a 1-D int array and values is a
+        (n_series, n_years) float array.
+    """
+    pairs = np.asarray(pairs, dtype=float).reshape(-1, 2)
+    year_start, year_end = int(year_start), int(year_end)
+    span = year_end - year_start
+    if span <= 0:
+        raise ValueError("year_end must be strictly greater than year_start.")
+
+    start = pairs[:, [0]]
+    end = pairs[:, [1]]
+    diff = end - start
+
+    # Quadratic weights across the whole span (same as quadratic_increments)
+    w = np.arange(1, span + 1, dtype=float) ** 2
+    w /= w.sum()
+    cums = start + np.cumsum(w * diff, axis=1)[:, :span - 1]
+
+    # Linear tail using the average annual increment
+    tail_steps = np.arange(1, max(projected_year - year_end, 0) + 1, dtype=float)
+    tail = end + (diff / span) * tail_steps
+
+    values = np.concatenate([start, cums, end, tail], axis=1)
+    years = np.arange(year_start, year_start + values.shape[1])
+
+    keep = years <= projected_year
+    return years[keep], values[:, keep]
+
+
+class QuadraticIncrementForecaster(Forecaster):
+    """
+    Quadratic fill between the last two observed years, then a linear tail
+    with the average annual increment of that span, as in
+    quadratic_increment_matrix. Years before the first anchor are NaN.
+    """
+    name = 'quadratic_increment'
+
+    def fit(self, years, values):
+        years = np.asarray(years)
+        if len(years) < 2 or not np.all(np.diff(years) > 0):
+            raise ValueError("Need at least two strictly increasing years.")
+        self.year_start, self.year_end = int(years[-2]), int(years[-1])
+        self.pairs = np.asarray(values, dtype=float)[:, -2:]
+        return self
+
+    def predict(self, years):
+        years = np.asarray(years)
+        _, values = quadratic_increment_matrix(
+            self.pairs, self.year_start, self.year_end, max(int(years.max()), self.year_end))
+        position = years - self.year_start
+        known = position >= 0
+        result = np.full((len(self.pairs), len(years)), np.nan)
+        result[:, known] = values[:, position[known]]
+        return result
+
+
+class LinearForecaster(Forecaster):
+    """Ordinary least-squares line through all observed years."""
+    name = 'linear'
+
+    def fit(self, years, values):
+        self.intercept, self.slope = _ols(np.asarray(years, dtype=float), np.asarray(values, dtype=float))
+        return self
+
+    def predict(self, years):
+        return self.intercept[:, None] + self.slope[:, None] * np.asarray(years, dtype=float)
+
+
+class LogLinearForecaster(Forecaster):
+    """
+    Constant yearly growth rate (CAGR): least squares on the log of the values.
+    Series with a value <= 0 cannot be logged and fall back to the linear fit.
+    """
+    name = 'log_linear'
+
+    def fit(self, years, values):
+        values = np.asarray(values, dtype=float)
+        self.positive = (values > 0).all(axis=1)
+        self.linear = LinearForecaster().fit(years, values)
+        self.intercept, self.slope = _ols(np.asarray(years, dtype=float), np.log(np.where(values > 0, values, 1)))
+        return self
+
+    @property
+    def growth_rate(self):
+        """Yearly growth rate of each series (NaN where the linear fallback is used)."""
+        return np.where(self.positive, np.expm1(self.slope), np.nan)
+
+    def predict(self, years):
+        log_linear = np.exp(self.intercept[:, None] + self.slope[:, None] * np.asarray(years, dtype=float))
+        return np.where(self.positive[:, None], log_linear, self.linear.predict(years))
+
+
+class LogisticForecaster(Forecaster):
+    """
+    Logistic (S-curve) growth saturating at a ceiling: least squares on the
+    logit of value / ceiling. The ceiling is `capacity` if given, otherwise
+    `capacity_factor` times the series' largest observed value. Series not
+    strictly between 0 and the ceiling fall back to the linear fit.
+    """
+    name = 'logistic'
+
+    def __init__(self, capacity=None, capacity_factor=2.0):
+        self.capacity = capacity
+        self.capacity_factor = capacity_factor
+
+    def fit(self, years, values):
+        values = np.asarray(values, dtype=float)
+        if self.capacity is not None:
+            self.ceiling = np.full(len(values), float(self.capacity))
+        else:
+            self.ceiling = self.capacity_factor * values.max(axis=1)
+
+        ceiling = self.ceiling[:, None]
+        self.valid = ((values > 0) & (values < ceiling)).all(axis=1)
+        self.linear = LinearForecaster().fit(years, values)
+
+        share = np.where(self.valid[:, None], values / np.where(ceiling > 0, ceiling, 1), 0.5)
+        self.intercept, self.slope = _ols(np.asarray(years, dtype=float), np.log(share / (1 - share)))
+        return self
+
+    def predict(self, years):
+        logistic = self.ceiling[:, None] / (1 + np.exp(-(self.intercept[:, None] + self.slope[:, None] * np.asarray(years, dtype=float))))
+        return np.where(self.valid[:, None], logistic, self.linear.predict(years))
+
+
+FORECASTERS = {
+    forecaster.name: forecaster
+    for forecaster in (QuadraticIncrementForecaster, LinearForecaster, LogLinearForecaster, LogisticForecaster)
+}
+DEFAULT_FORECASTER = 'quadratic_increment'
+
+
+def get_forecaster(name=None, **options):
+    """
+    New forecaster from the registry.
+
+    Args:
+        name (str): Key of FORECASTERS; DEFAULT_FORECASTER if None.
+        **options: Options of the forecaster (e.g. capacity for 'logistic').
+
+    Raises:
+        ValueError: If the name is not registered.
+    """
+    name = name or DEFAULT_FORECASTER
+    if name not in FORECASTERS:
+        raise ValueError(f"Unknown forecaster: {name}. Choose from {sorted(FORECASTERS)}")
+    return FORECASTERS[name](**options)
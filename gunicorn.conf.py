@@ -0,0 +1,29 @@
+"""
+gunicorn settings of the API.
+
+    gunicorn -c gunicorn.conf.py flask_app:app
+
+Before forking the workers, the master ingests the data store and publishes
+the projection arrays (see build_artifacts.ensure_projection_arrays). Workers
+then only memory-map them: no CSV is parsed and no projection is built at
+worker boot, and every worker shares the same pages.
+"""
+import json
+import os
+
+
+bind = os.environ.get("GMED_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("GMED_WORKERS", "2"))
+
+
+def on_starting(server):
+    from build_artifacts import ensure_projection_arrays
+    from data_access import WorldData
+    from data_store import ingest
+
+    with open("parameters.json") as f:
+        config = json.load(f)
+
+    ingest()
+    if config.get("shared_projections", True):
+        ensure_projection_arrays(WorldData.from_store(), backcast=config.get("backcast", "per_disease"))
@@ -1,23 +1,18 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import json
-from model import Model
+from impact import intervention_impact
+from app_cache import load_config, get_table, get_model, table_line_chart
 
 # Load JSON configuration
-with open('parameters.json') as f:
-    CONFIG = json.load(f)
+CONFIG = load_config()
 
 # Load data
-prevalence_data = pd.read_csv('indonesia_ncd_prevalence_cleaned.csv', index_col=0)
-econ_data = pd.read_csv('indonesia_ncd_economic_burden_cleaned.csv', index_col=0)
-econ_burden_undiag_data = pd.read_csv("indonesia_ncd_economic_burden_undiagnosed_cleaned.csv", index_col=0)
-provinces_data = pd.read_csv('provinces_population.csv')
-provinces_data['Population'] = provinces_data['Population'].fillna('0') \
-    .str.replace('"', '', regex=False).str.replace(',', '', regex=False).astype(int)
+prevalence_data = get_table('indonesia_prevalence')
+econ_burden_undiag_data = get_table('indonesia_economic_burden_undiagnosed')
+provinces_data = get_table('provinces')
 
 # Model instance
-model = Model()
+model = get_model()
 
 # Intervention logic (previously in Flask)
 def run_intervention_model(disease, province, year, clinics, providers, capacity_pct):
@@ -46,12 +41,7 @@ def run_intervention_model(disease, province, year, clinics, providers, capacity
     undiagnosed = susceptible_population * undiagnosed_ratio
     econ_burden_per_capita = economic_burden / undiagnosed if undiagnosed > 0 else 0
 
-    intervention_capacity = capacity_yearly * clinics * providers * capacity_pct / 100 / 20
-    pct_undiag_before = undiagnosed_ratio * 100
-    pct_undiag_after = max(0, pct_undiag_before * (1 - (intervention_capacity / undiagnosed))) if undiagnosed > 0 else 0
-
-    economic_burden_after = max(0, economic_burden * (1 - intervention_capacity / undiagnosed)) if undiagnosed > 0 else 0
-    economic_burden_delta = economic_burden - economic_burden_after
+    impact = intervention_impact(capacity_yearly, clinics, providers, capacity_pct, undiagnosed, undiagnosed_ratio, economic_burden)
 
     return {
         "population": round(projected_pop),
@@ -60,11 +50,11 @@ def run_intervention_model(disease, province, year, clinics, providers, capacity
         "susceptible_undiagnosed": round(undiagnosed),
         "economic_burden": round(economic_burden),
         "economic_burden_per_capita": round(econ_burden_per_capita),
-        "intervention_capacity": round(intervention_capacity),
-        "pct_undiag_before": round(pct_undiag_before, 2),
-        "pct_undiag_after": round(pct_undiag_after, 2),
-        "economic_burden_after": round(economic_burden_after),
-        "economic_burden_delta": round(economic_burden_delta)
+        "intervention_capacity": round(impact["intervention_capacity"]),
+        "pct_undiag_before": round(impact["pct_undiag_before"], 2),
+        "pct_undiag_after": round(impact["pct_undiag_after"], 2),
+        "economic_burden_after": round(impact["economic_burden_after"]),
+        "economic_burden_delta": round(impact["economic_burden_delta"])
     }
 
 
@@ -76,8 +66,8 @@ default_clinics = int(provinces_data['Number of Clinics'].values[-1])
 diseases = list(CONFIG['undiagnosed_ratio'].keys())
 
 selected_disease = st.selectbox('Select the Non-Communicable Diseases (NCD) of Interest:', diseases)
-st.plotly_chart(model.line_chart(prevalence_data, selected_disease))
-st.plotly_chart(model.line_chart_economy(econ_data, selected_disease))
+st.plotly_chart(table_line_chart('indonesia_prevalence', selected_disease))
+st.plotly_chart(table_line_chart('indonesia_economic_burden', selected_disease, economy=True))
 
 # st.markdown('#### At a Glance: Economic Burden of NCDs Compared')
 # fig_compare, df_long = model.line_chart_economy_disease_compare(econ_data, top=5)
@@ -0,0 +1,147 @@
+import numpy as np
+
+
+IMPACT_FIELDS = [
+    "intervention_capacity", "pct_undiag_before", "pct_undiag_after",
+    "economic_burden_after", "economic_burden_delta",
+]
+
+# yearly growth of the population 40+ assumed by the worldwide routes
+WORLDWIDE_GROWTH_RATE = 0.01
+
+
+def intervention_capacity(clinics, providers, capacity_pct, capacity_yearly):
+    """
+    Undiagnosed patients the clinics can reach, given the capacity_pct (%) of
+    their providers' yearly capacity allocated to the NCD. Arguments broadcast
+    like intervention_impact.
+    """
+    return capacity_yearly * np.asarray(clinics) * np.asarray(providers) * np.asarray(capacity_pct) / 100 / 20
+
+
+def intervention_impact(capacity_yearly, clinics, providers, capacity_pct, undiagnosed, undiagnosed_ratio, economic_burden):
+    """
+    Impact of the clinics on the undiagnosed population and its economic burden.
+
+    Every argument may be a scalar or a NumPy array; arrays broadcast against
+    each other, so whole scenario grids are evaluated in a single pass.
+
+    Args:
+        capacity_yearly (float): Patients served per provider per year (parameters.json).
+        clinics (int or np.ndarray): Number of clinics.
+        providers (int or np.ndarray): Medical providers per clinic.
+        capacity_pct (float or np.ndarray): Capacity allocation (%) to the NCD.
+        undiagnosed (float or np.ndarray): Susceptible population (undiagnosed).
+        undiagnosed_ratio (float or np.ndarray): Share of the susceptible population undiagnosed.
+        economic_burden (float or np.ndarray): Economic burden before the intervention.
+
+    Returns:
+        dict: IMPACT_FIELDS -> unrounded values (scalars for scalar inputs).
+    """
+    undiagnosed = np.asarray(undiagnosed, dtype=float)
+    economic_burden = np.asarray(economic_burden, dtype=float)
+
+    has_undiagnosed = undiagnosed > 0
+    safe_undiagnosed = np.where(has_undiagnosed, undiagnosed, 1)
+
+    # Intervention calculation
+    capacity = intervention_capacity(clinics, providers, capacity_pct, capacity_yearly)
+    pct_undiag_before = np.asarray(undiagnosed_ratio, dtype=float) * 100
+    pct_undiag_after = np.where(has_undiagnosed, np.maximum(0, pct_undiag_before * (1 - (capacity / safe_undiagnosed))), 0)
+
+    economic_burden_after = np.where(has_undiagnosed, np.maximum(0, economic_burden * (1 - capacity / safe_undiagnosed)), 0)
+    economic_burden_delta = economic_burden - economic_burden_after
+
+    # [()] turns 0-d results back into scalars and leaves arrays untouched
+    return {
+        "intervention_capacity": capacity[()],
+        "pct_undiag_before": pct_undiag_before[()],
+        "pct_undiag_after": pct_undiag_after[()],
+        "economic_burden_after": economic_burden_after[()],
+        "economic_burden_delta": economic_burden_delta[()],
+    }
+
+
+def predict_baseline(old_population, old_population_all, growth_rate, year, prevalence_pct, burden_unit_cost, undiagnosed_ratio):
+    """
+    Burden of a disease in a province of Indonesia before any intervention (/predict).
+
+    Every argument may be a scalar or a NumPy array and they broadcast like
+    in `intervention_impact`.
+
+    Args:
+        old_population (float or np.ndarray): Population 40+ of the province in 2024.
+        old_population_all (float or np.ndarray): Population 40+ of Indonesia in 2024.
+        growth_rate (float or np.ndarray): Yearly population growth rate.
+        year (int or np.ndarray): Selected year.
+        prevalence_pct (float or np.ndarray): National prevalence (%) in the selected year.
+        burden_unit_cost (float or np.ndarray): National economic burden of the undiagnosed.
+        undiagnosed_ratio (float or np.ndarray): Share of the susceptible population undiagnosed.
+
+    Returns:
+        dict: /predict burden fields -> unrounded values.
+    """
+    # Compute projected population
+    growth = 1 + growth_rate * (np.asarray(year) - 2024)
+    projected_pop = old_population * growth
+    susceptible_population = projected_pop * prevalence_pct / 100
+
+    # National baseline
+    projected_pop_all = old_population_all * growth
+    susceptible_all = projected_pop_all * prevalence_pct / 100
+
+    # Economic burden
+    economic_burden = burden_unit_cost * (susceptible_population / susceptible_all)
+
+    # Split population
+    diagnosed = susceptible_population * (1 - undiagnosed_ratio)
+    undiagnosed = susceptible_population * undiagnosed_ratio
+    econ_burden_per_capita = np.where(undiagnosed > 0, economic_burden / np.where(undiagnosed > 0, undiagnosed, 1), 0)
+
+    return {
+        "population": projected_pop,
+        "susceptible_population": susceptible_population,
+        "susceptible_diagnosed": diagnosed,
+        "susceptible_undiagnosed": undiagnosed,
+        "economic_burden": economic_burden,
+        "economic_burden_per_capita": econ_burden_per_capita,
+    }
+
+
+def worldwide_baseline(old_population_all, prevalence, economic_burden_projected, year, undiagnosed_ratio, growth_rate=WORLDWIDE_GROWTH_RATE):
+    """
+    Burden of a disease in a country before any intervention (/predict_worldwide).
+
+    Args:
+        old_population_all (float or np.ndarray): Population 40+ in 2024.
+        prevalence (float or np.ndarray): Prevalence of the population 40+ (fraction).
+        economic_burden_projected (float or np.ndarray): Projected economic burden in the selected year.
+        year (int or np.ndarray): Selected year.
+        undiagnosed_ratio (float or np.ndarray): Share of the susceptible population undiagnosed.
+        growth_rate (float or np.ndarray): Yearly population growth rate.
+
+    Returns:
+        dict: /predict_worldwide burden fields -> unrounded values.
+    """
+    default_year = 2024
+
+    susceptible_population_multiple = (old_population_all + (old_population_all * growth_rate * (year - default_year))) * prevalence
+
+    select_year_old_population = old_population_all + (old_population_all * growth_rate * (year - 2024))
+    susceptible_population = select_year_old_population * prevalence
+    # NOTE: Economic Burden below only for the undiagnosed
+    economic_burden = economic_burden_projected * (susceptible_population / susceptible_population_multiple)
+
+    susceptible_population_diagnosed = susceptible_population * (1 - undiagnosed_ratio)
+    susceptible_population_undiagnosed = susceptible_population * undiagnosed_ratio
+
+    economic_burden_per_capita = economic_burden / susceptible_population
+
+    return {
+        "population": select_year_old_population,
+        "susceptible_population": susceptible_population,
+        "susceptible_population_diagnosed": susceptible_population_diagnosed,
+        "susceptible_population_undiagnosed": susceptible_population_undiagnosed,
+        "economic_burden": economic_burden,
+        "economic_burden_per_capita": economic_burden_per_capita,
+    }
@@ -0,0 +1,140 @@
+"""
+Smallest intervention that reaches a target, by inverting intervention_impact.
+
+The intervention capacity (impact.intervention_capacity) is
+
+    capacity_yearly * clinics * providers * capacity_pct / 100 / 20
+
+and both pct_undiag_after and economic_burden_delta are linear in it until
+the undiagnosed population is cleared, so the capacity needed for a target
+has a closed form (`required_capacity`). `minimal_intervention` turns it into
+whole clinics and providers: closed form when only one of clinics, providers
+and capacity_pct is free, and a vectorized search over provider counts when
+both clinics and providers are.
+"""
+import numpy as np
+
+from impact import intervention_capacity
+
+
+def required_capacity(undiagnosed, undiagnosed_ratio, economic_burden,
+                      target_pct_undiag_after=None, target_burden_reduction=None):
+    """
+    Intervention capacity needed to reach a target.
+
+    Args:
+        undiagnosed (np.ndarray): Susceptible population (undiagnosed).
+        undiagnosed_ratio (np.ndarray): Share of the susceptible population undiagnosed.
+        economic_burden (np.ndarray): Economic burden before the intervention.
+        target_pct_undiag_after (float or np.ndarray): Highest acceptable pct_undiag_after.
+        target_burden_reduction (float or np.ndarray): Lowest acceptable economic_burden_delta ($).
+
+    Returns:
+        tuple: (capacity, feasible) arrays. Burden reductions above the
+        economic burden are not feasible; their capacity clears the whole
+        undiagnosed population.
+
+    Raises:
+        ValueError: If not exactly one target is given, or it is negative.
+    """
+    if (target_pct_undiag_after is None) == (target_burden_reduction is None):
+        raise ValueError("Give one of target_pct_undiag_after and target_burden_reduction")
+
+    undiagnosed = np.asarray(undiagnosed, dtype=float)
+    has_undiagnosed = undiagnosed > 0
+
+    if target_pct_undiag_after is not None:
+        target = np.asarray(target_pct_undiag_after, dtype=float)
+        if (target < 0).any():
+            raise ValueError("target_pct_undiag_after must not be negative")
+        pct_undiag_before = np.asarray(undiagnosed_ratio, dtype=float) * 100
+        # pct_before * (1 - C / U) <= target
+        share = np.where(pct_undiag_before > target, 1 - target / np.where(pct_undiag_before > 0, pct_undiag_before, 1), 0)
+        feasible = np.ones(np.broadcast(undiagnosed, share).shape, dtype=bool)
+    else:
+        target = np.asarray(target_burden_reduction, dtype=float)
+        if (target < 0).any():
+            raise ValueError("target_burden_reduction must not be negative")
+        economic_burden = np.asarray(economic_burden, dtype=float)
+        # economic_burden * min(1, C / U) >= target
+        share = np.where(economic_burden > 0, target / np.where(economic_burden > 0, economic_burden, 1), np.where(target > 0, np.inf, 0))
+        feasible = share <= 1
+        share = np.minimum(share, 1)
+
+    capacity = np.where(has_undiagnosed, undiagnosed * share, 0)
+    return capacity, feasible
+
+
+def minimal_intervention(capacity_yearly, required, clinics=None, providers=None, capacity_pct=None, max_providers=10):
+    """
+    Smallest clinics / providers / capacity_pct reaching the required capacity.
+
+    Give two of clinics, providers and capacity_pct to solve the third, or only
+    capacity_pct to search the clinics and providers with the fewest providers
+    in total (ties go to fewer clinics).
+
+    Args:
+        capacity_yearly (float): Patients served per provider per year.
+        required (np.ndarray): Required intervention capacity.
+        clinics, providers (int or np.ndarray): Fixed clinics / providers per clinic.
+        capacity_pct (float or np.ndarray): Fixed capacity allocation (%).
+        max_providers (int): Largest providers per clinic searched.
+
+    Returns:
+        dict: 'clinics', 'providers', 'capacity_pct' and 'feasible' arrays.
+
+    Raises:
+        ValueError: If the free inputs are not supported.
+    """
+    required = np.asarray(required, dtype=float)
+    free = [name for name, value in (('clinics', clinics), ('providers', providers), ('capacity_pct', capacity_pct)) if value is None]
+
+    # staff-pct needed: clinics * providers * capacity_pct
+    needed = required * 100 * 20 / capacity_yearly
+
+    def solve(needed, divisor, step=1):
+        # smallest multiple of `step` covering `needed`; impossible if the fixed inputs are zero
+        divisor = np.asarray(divisor, dtype=float)
+        possible = (divisor > 0) | (needed == 0)
+        value = np.ceil(needed / np.where(divisor > 0, divisor, 1) / step) * step
+        return np.where(divisor > 0, value, 0), possible
+
+    if free == ['clinics']:
+        clinics, feasible = solve(needed, np.asarray(providers) * np.asarray(capacity_pct))
+    elif free == ['providers']:
+        providers, feasible = solve(needed, np.asarray(clinics) * np.asarray(capacity_pct))
+    elif free == ['capacity_pct']:
+        # hundredths of a percent, rounded up so the rounded value still reaches the target
+        capacity_pct, feasible = solve(needed, np.asarray(clinics) * np.asarray(providers), step=0.01)
+        feasible = feasible & (capacity_pct <= 100)
+        capacity_pct = np.minimum(capacity_pct, 100)
+    elif free == ['clinics', 'providers']:
+        options = np.arange(1, max_providers + 1)
+        clinics_needed, possible = solve(needed[..., None], options * np.asarray(capacity_pct)[..., None])
+        feasible = possible[..., 0]
+        # fewest providers in total; the last (largest provider count) minimum means the fewest clinics
+        staff = clinics_needed * options
+        best = staff.shape[-1] - 1 - np.argmin(staff[..., ::-1], axis=-1)
+        clinics = np.take_along_axis(clinics_needed, best[..., None], axis=-1)[..., 0]
+        providers = np.where(clinics > 0, options[best], 0)
+    else:
+        raise ValueError("Give capacity_pct and at most one of clinics and providers")
+
+    clinics, providers, capacity_pct, required, feasible = np.broadcast_arrays(
+        np.asarray(clinics, dtype=float), np.asarray(providers, dtype=float), np.asarray(capacity_pct, dtype=float),
+        required, feasible)
+    clinics, providers = clinics.copy(), providers.copy()
+
+    # floating point: step up a whole clinic or provider if the rounded-up solution still falls short
+    short = feasible & (intervention_capacity(clinics, providers, capacity_pct, capacity_yearly) < required)
+    if 'clinics' in free:
+        clinics[short] += 1
+    elif 'providers' in free:
+        providers[short] += 1
+
+    return {
+        'clinics': clinics,
+        'providers': providers,
+        'capacity_pct': capacity_pct,
+        'feasible': feasible & (intervention_capacity(clinics, providers, capacity_pct, capacity_yearly) >= required),
+    }
@@ -0,0 +1,42 @@
+"""
+Split of a clinic fleet's capacity across diseases.
+
+With capacity C_d given to disease d, the burden averted is
+
+    economic_burden_d * min(1, C_d / undiagnosed_d) = b_d * min(C_d, undiagnosed_d)
+
+with b_d the burden per undiagnosed person (see intervention_impact). Its sum
+over diseases, under sum C_d <= total capacity, is a fractional knapsack: the
+LP optimum serves the diseases in decreasing b_d, each until its undiagnosed
+population is cleared. `allocate_capacity` solves it for many scenarios at
+once on (scenario, disease) arrays.
+"""
+import numpy as np
+
+
+def allocate_capacity(total_capacity, undiagnosed, burden_per_undiagnosed):
+    """
+    Capacity split maximizing the total burden averted.
+
+    Args:
+        total_capacity (np.ndarray): Capacity of the whole fleet, (scenario,).
+        undiagnosed (np.ndarray): Undiagnosed population, (scenario, disease);
+            0 for padding.
+        burden_per_undiagnosed (np.ndarray): Economic burden per undiagnosed
+            person, (scenario, disease).
+
+    Returns:
+        np.ndarray: Capacity given to each disease, (scenario, disease).
+    """
+    undiagnosed = np.asarray(undiagnosed, dtype=float)
+    total_capacity = np.asarray(total_capacity, dtype=float)
+
+    # most burden per person first
+    order = np.argsort(-np.asarray(burden_per_undiagnosed, dtype=float), axis=1, kind='stable')
+    need = np.take_along_axis(undiagnosed, order, axis=1)
+    served_before = np.cumsum(need, axis=1) - need
+    allocation_sorted = np.clip(total_capacity[:, None] - served_before, 0, need)
+
+    allocation = np.empty_like(allocation_sorted)
+    np.put_along_axis(allocation, order, allocation_sorted, axis=1)
+    return allocation
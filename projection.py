@@ -0,0 +1,343 @@
+import pandas as pd
+import numpy as np
+from data_access import WorldData
+from forecasting import get_forecaster, quadratic_increment_matrix
+
+BACKCAST_MODES = ('per_disease', 'shared')
+
+
+def backcast_multiplier(current, growth, groups=None, multiplier=10.0):
+    """
+    Years of growth subtracted from the 2024 value to back-cast 2014.
+
+    The largest multiplier / 2**k (k >= 0) keeping current - multiplier * growth
+    non-negative, in closed form: k = ceil(log2(multiplier * growth / current)).
+    With groups (e.g. country codes) every row of a group gets the smallest
+    multiplier of the group, which is what halving one shared multiplier until
+    no row is negative converges to. Rows that no multiplier keeps
+    non-negative (a value <= 0 that still grows) get 0.
+
+    Args:
+        current (np.ndarray): 2024 values.
+        growth (np.ndarray): Yearly growth of the values.
+        groups (np.ndarray): Integer group codes sharing one multiplier, or None.
+        multiplier (float): Multiplier before any halving.
+
+    Returns:
+        np.ndarray: Multiplier of each row.
+    """
+    current = np.asarray(current, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+
+    def negative(halvings):
+        return current - np.ldexp(multiplier, -halvings) * growth < 0
+
+    feasible = current > 0
+    ratio = np.where(feasible & (growth > 0), multiplier * growth / np.where(feasible, current, 1), 1)
+    halvings = np.maximum(np.ceil(np.log2(ratio)).astype(int) - 1, 0)
+    # log2 rounds either way: step to the first halving count that is not negative
+    for _ in range(2):
+        halvings += feasible & negative(halvings)
+    result = np.where(feasible | ~negative(np.zeros_like(halvings)), np.ldexp(multiplier, -halvings), 0.0)
+
+    if groups is not None:
+        shared = np.full(groups.max() + 1 if len(groups) else 0, np.inf)
+        np.minimum.at(shared, groups, result)
+        result = shared[groups]
+    return result
+
+
+class ProjectionModel:
+    """
+    Pure NumPy/pandas compute core of Model: reshaping the world data and
+    projecting it to future years. It does not import plotly, so the API
+    workers load it without the charting stack.
+    """
+
+    def __init__(self):
+        self.data = None
+
+    def _country_rows(self, df, country):
+        # WorldData fetches the country through its index, DataFrames are filtered
+        if isinstance(df, WorldData):
+            return df.country(country)
+        return df[df['Country'] == country]
+
+    def transform_country_disease(self, df, country):
+        """
+        Transform the dataframe for a specific country to have diseases as columns
+        and years (2014, 2024) as rows.
+
+        Args:
+            df (pd.DataFrame): Input DataFrame.
+            country (str): The country to filter.
+
+        Returns:
+            pd.DataFrame: Transformed DataFrame with years as index and diseases as columns.
+        """
+        
+        df.rename(columns={
+            'Economic Burden over 40 ($) - 2014': 2014,
+            'Economic Burden over 40 ($) - 2024': 2024
+            
+        }, inplace = True)
+        # Filter for the selected country
+        country_df = df[df['Country'] == country]
+
+        # Set 'Disease' as columns, '2014' and '2024' as rows
+        transformed = country_df.set_index('Disease')[[2014, 2024]].T
+
+        return transformed
+    
+
+
+
+    # def extend_years_quadratic_increment(self, transformed_df, projected_year):
+    #     """
+    #     Extend the transformed dataframe by filling in missing years with quadratic increments
+    #     between the last two known years, and then continue extending linearly using the last increment
+    #     to the projected_year.
+
+    #     Args:
+    #         transformed_df (pd.DataFrame): DataFrame with Year as index and diseases as columns.
+    #         projected_year (int): The year to extend to.
+
+    #     Returns:
+    #         pd.DataFrame: Extended DataFrame with quadratic progression and then linear extension.
+    #     """
+
+    #     def quadratic_increments(start, end, years):
+    #         """Generate a list of increments that grow quadratically while summing to (end - start)."""
+    #         total_diff = end - start
+    #         weights = np.array([(i+1)**2 for i in range(years)])  # Quadratic growth
+    #         weights = weights / weights.sum()  # Normalize so that sum(weights) = 1
+    #         increments = weights * total_diff  # Scale weights to match total difference
+    #         return increments
+
+    #     # --- Step 1: Prepare the dataframe ---
+    #     df = transformed_df.copy()
+    #     years = df.index.tolist()
+    #     year_start, year_end = years[-2:]
+
+    #     # Generate quadratic interpolation between year_start and year_end
+    #     intermediate_years = list(range(year_start + 1, year_end))
+    #     quadratic_growth = {year: {} for year in intermediate_years}
+
+    #     for disease in df.columns:
+    #         inc_values = quadratic_increments(df.loc[year_start, disease], df.loc[year_end, disease], len(intermediate_years) + 1)
+    #         for i, year in enumerate(intermediate_years):
+    #             quadratic_growth[year][disease] = df.loc[year_start, disease] + sum(inc_values[:i+1])
+
+    #     # Create the interpolated DataFrame
+    #     interpolated_df = pd.DataFrame(quadratic_growth).T
+
+    #     # --- Step 2: Append original years and interpolated years ---
+    #     extended_df = pd.concat([df.loc[[year_start]], interpolated_df, df.loc[[year_end]]])
+
+    #     # --- Step 3: Extrapolate beyond year_end using the last increment value ---
+    #     final_increments = {
+    #         disease: quadratic_increments(df.loc[year_start, disease], df.loc[year_end, disease], len(intermediate_years) + 1)[-1]
+    #         for disease in df.columns
+    #     }
+
+    #     future_years = {
+    #         year: extended_df.loc[year_end] + pd.Series(final_increments) * (year - year_end)
+    #         for year in range(year_end + 1, projected_year + 1)
+    #     }
+    #     future_df = pd.DataFrame(future_years).T
+
+    #     # --- Step 4: Combine everything ---
+    #     final_df = pd.concat([extended_df, future_df])
+
+    #     # Ensure index is integer
+    #     final_df.index = final_df.index.astype(int)
+    #     final_df = final_df.sort_index()
+
+    #     return final_df
+    
+    def extend_years_quadratic_increment(self, transformed_df, projected_year):
+        """
+        Quadratic between the last two known years (for intermediates), then
+        linear beyond the end year using the SAME average annual increment
+        as the (start->end) span.
+
+        All diseases are projected in one call to `quadratic_increment_matrix`.
+        """
+        # --- Prep ---
+        years = list(transformed_df.index)
+        if len(years) < 2:
+            raise ValueError("transformed_df must contain at least two years.")
+        year_start, year_end = int(years[-2]), int(years[-1])
+        if year_end - year_start <= 0:
+            raise ValueError("The last two years must be strictly increasing.")
+
+        # (start, end) pair per disease column
+        pairs = transformed_df.iloc[-2:].to_numpy(dtype=float).T
+
+        out_years, values = self.quadratic_increment_matrix(pairs, year_start, year_end, projected_year)
+
+        return pd.DataFrame(values.T, index=out_years.astype(int), columns=transformed_df.columns)
+
+    def extend_years(self, transformed_df, projected_year, forecaster=None):
+        """
+        Extend the transformed dataframe to projected_year with a forecaster.
+
+        Args:
+            transformed_df (pd.DataFrame): DataFrame with Year as index and diseases as columns.
+            projected_year (int): The year to extend to.
+            forecaster (str or Forecaster): Name in forecasting.FORECASTERS (or an
+                instance); the quadratic increment of
+                `extend_years_quadratic_increment` if None.
+
+        Returns:
+            pd.DataFrame: Forecast from the first known year to projected_year
+            (from the second-last one for the quadratic increment).
+        """
+        if forecaster is None or isinstance(forecaster, str):
+            forecaster = get_forecaster(forecaster)
+        if forecaster.name == 'quadratic_increment':
+            return self.extend_years_quadratic_increment(transformed_df, projected_year)
+
+        years = transformed_df.index.to_numpy(dtype=int)
+        out_years = np.arange(years[0], projected_year + 1)
+        values = forecaster.fit(years, transformed_df.to_numpy(dtype=float).T).predict(out_years)
+
+        return pd.DataFrame(values.T, index=out_years, columns=transformed_df.columns)
+
+
+
+
+
+    def transform_country_disease_new(self, df, country, backcast='per_disease'):
+        """
+        Transform the dataframe for a specific country to have diseases as columns
+        and years (2014, 2024) as rows. Uses current value and computes past value.
+
+        Args:
+            df (pd.DataFrame or WorldData): Input data with 'Economic Burden ($)' and 
+                            'Economic Burden Growth Yearly ($)'.
+            country (str): The country to filter.
+            backcast (str): 'per_disease' halves each disease's multiplier of the
+                yearly growth until its own 2014 value is non-negative; 'shared'
+                halves one multiplier for all diseases of the country, as before.
+
+        Returns:
+            pd.DataFrame: Transformed DataFrame with years as index and diseases as columns.
+        """
+        if backcast not in BACKCAST_MODES:
+            raise ValueError(f"backcast must be one of {BACKCAST_MODES}.")
+
+        # Filter for the selected country
+        country_df = self._country_rows(df, country).copy()
+
+        # Calculate values for 2014 and 2024
+        current = country_df['Economic Burden ($)'].to_numpy(dtype=float)
+        growth = country_df['Economic Burden Growth Yearly ($)'].to_numpy(dtype=float)
+        groups = np.zeros(len(country_df), dtype=int) if backcast == 'shared' else None
+
+        country_df[2024] = country_df['Economic Burden ($)']
+        country_df[2014] = current - backcast_multiplier(current, growth, groups) * growth
+
+        # Transform to desired structure
+        transformed = country_df.set_index('Disease')[[2014, 2024]].T
+
+        return transformed
+
+
+    def transform_country_disease_prevalence_new(self, df, country):
+        """
+        Transform the dataframe for a specific country to have diseases as columns
+        and years (2014, 2024) as rows. Uses current value and computes past value.
+
+        Args:
+            df (pd.DataFrame or WorldData): Input data with 'Prevalence % 40+' and 
+                            'Prevalence % Growth Yearly'.
+            country (str): The country to filter.
+
+        Returns:
+            pd.DataFrame: Transformed DataFrame with years as index and diseases as columns.
+        """
+        # Filter for the selected country
+        country_df = self._country_rows(df, country).copy()
+
+        # Calculate values for 2014 and 2024
+        country_df[2024] = country_df['Prevalence % 40+'] * 100
+        country_df[2014] = (country_df['Prevalence % 40+'] - 10 * country_df['Prevalence % Growth Yearly']) * 100
+
+        # Transform to desired structure
+        transformed = country_df.set_index('Disease')[[2014, 2024]].T
+
+        return transformed
+
+
+    def quadratic_increment_matrix(self, pairs, year_start, year_end, projected_year):
+        """
+        Vectorized form of `extend_years_quadratic_increment` for many series at once.
+        Quadratic fill between year_start and year_end, then linear tail using the
+        average annual increment of the span.
+
+        Args:
+            pairs (array-like): (n_series, 2) array of (start, end) values.
+            year_start (int): Year of the start values.
+            year_end (int): Year of the end values.
+            projected_year (int): The year to extend to.
+
+        Returns:
+            tuple: (years, values) where years is a 1-D int array and values is a
+            (n_series, n_years) float array.
+        """
+        return quadratic_increment_matrix(pairs, year_start, year_end, projected_year)
+
+
+    def project_all_countries(self, df, projected_year, kind='economic_burden', forecaster=None, backcast='per_disease'):
+        """
+        Project every (country, disease) row of the world data in one pass.
+        Equivalent to calling `transform_country_disease_new` (or the prevalence
+        variant) and `extend_years_quadratic_increment` for each country.
+
+        Args:
+            df (pd.DataFrame or WorldData): World data with 'Country' and 'Disease' columns.
+            projected_year (int): The year to extend to.
+            kind (str): 'economic_burden' or 'prevalence'.
+            forecaster (str or Forecaster): Name in forecasting.FORECASTERS (or an
+                instance) fitted to the 2014 and 2024 values of every row in
+                one batch; the quadratic increment if None.
+            backcast (str): Economic burden back-cast, see `transform_country_disease_new`.
+
+        Returns:
+            pd.DataFrame: Long panel with columns 'Country', 'Disease', 'Year' and
+            'Economic Burden ($)' or 'Prevalence (%)'.
+        """
+        if isinstance(df, WorldData):
+            df = df.frame
+
+        if kind == 'economic_burden':
+            value_column = 'Economic Burden ($)'
+            current = df['Economic Burden ($)'].to_numpy(dtype=float)
+            growth = df['Economic Burden Growth Yearly ($)'].to_numpy(dtype=float)
+
+            if backcast not in BACKCAST_MODES:
+                raise ValueError(f"backcast must be one of {BACKCAST_MODES}.")
+            # Back-cast 2014 for every row at once, sharing the multiplier within a country if asked
+            groups = pd.factorize(df['Country'])[0] if backcast == 'shared' else None
+            past = current - backcast_multiplier(current, growth, groups) * growth
+        elif kind == 'prevalence':
+            value_column = 'Prevalence (%)'
+            prevalence = df['Prevalence % 40+'].to_numpy(dtype=float)
+            growth = df['Prevalence % Growth Yearly'].to_numpy(dtype=float)
+            current = prevalence * 100
+            past = (prevalence - 10 * growth) * 100
+        else:
+            raise ValueError("kind must be 'economic_burden' or 'prevalence'.")
+
+        if forecaster is None or isinstance(forecaster, str):
+            forecaster = get_forecaster(forecaster)
+        years = np.arange(2014, projected_year + 1)
+        values = forecaster.fit([2014, 2024], np.column_stack([past, current])).predict(years)
+
+        return pd.DataFrame({
+            'Country': np.repeat(df['Country'].to_numpy(), len(years)),
+            'Disease': np.repeat(df['Disease'].to_numpy(), len(years)),
+            'Year': np.tile(years, len(df)),
+            value_column: values.ravel(),
+        })
@@ -0,0 +1,136 @@
+"""
+Cache of serialized API responses.
+
+/predict, /predict_worldwide, /scenario_worldwide and /impact_worldwide
+depend only on their JSON body and the loaded data. A repeated body is
+answered with the bytes encoded the first time: nothing is computed and
+nothing is re-encoded.
+
+Entries are keyed on the route and the canonical form of the body (sorted
+keys, no whitespace), so key order and formatting do not matter. The cache
+holds at most `max_entries` bodies, evicting the least recently used, and
+drops an entry `ttl_seconds` after it was stored. Every lookup carries the
+data version (see build_artifacts.world_data_version); when it changes, for
+instance after /rebuild_worldwide, the whole cache is cleared.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+# entries kept and their lifetime in seconds (None: until evicted); overridden
+# by "response_cache" in parameters.json
+DEFAULT_SETTINGS = {
+    "max_entries": 4096,
+    "ttl_seconds": 3600,
+}
+
+
+def canonical_key(path, data):
+    """Cache key of a request: its route and its body with sorted keys, without whitespace."""
+    return path + " " + json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of response bodies with a time to live.
+
+    Args:
+        max_entries (int): Bodies kept; 0 disables the cache.
+        ttl_seconds (float): Lifetime of an entry, None to keep it until evicted.
+        clock (callable): Time source in seconds.
+    """
+
+    def __init__(self, max_entries=DEFAULT_SETTINGS["max_entries"], ttl_seconds=DEFAULT_SETTINGS["ttl_seconds"],
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Cache with DEFAULT_SETTINGS overridden by "response_cache" in `config`."""
+        settings = {**DEFAULT_SETTINGS, **config.get("response_cache", {})}
+        return cls(settings["max_entries"], settings["ttl_seconds"])
+
+    def _check_version(self, version):
+        # called with the lock held
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key, version):
+        """Cached body of `key` under data `version`, or None."""
+        if not self.max_entries:
+            return None
+
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and self.clock() >= entry[1]:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, version, body):
+        """Store `body` under `key`, evicting the least recently used entries beyond max_entries."""
+        if not self.max_entries:
+            return
+
+        expires = None if self.ttl_seconds is None else self.clock() + self.ttl_seconds
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (body, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_encode(self, path, data, version, compute, encode):
+        """
+        Body of the response to `data` on `path`: the cached bytes, or
+        `encode(compute(data))`, stored before it is returned. Errors raised by
+        `compute` propagate and nothing is stored.
+        """
+        key = canonical_key(path, data)
+        body = self.get(key, version)
+        if body is None:
+            body = encode(compute(data))
+            self.put(key, version, body)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters since start-up, plus the current size and settings."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "data_version": self.version,
+            }
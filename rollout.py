@@ -0,0 +1,98 @@
+"""
+Multi-year impact of a clinic rollout.
+
+Unlike the single-year formulas of impact.py, people diagnosed by the clinics
+stay diagnosed: each year the clinics work through the undiagnosed population
+left after the previous years, while the susceptible population follows the
+projected prevalence. Arrays are (scenario, year); the years are stepped in
+order, every scenario at once.
+"""
+import numpy as np
+
+
+def clinic_schedule(years, schedule=None, ramp=None):
+    """
+    Clinics operating in each year.
+
+    Args:
+        years (np.ndarray): Simulated years.
+        schedule (dict): Year -> clinics from that year on (forward-filled,
+            0 before the first year given); at least one year.
+        ramp (dict): {'start', 'end', 'clinics'}: a linear ramp from
+            clinics / (end - start + 1) in `start` up to `clinics` in `end`.
+
+    Returns:
+        np.ndarray: Clinics per year.
+
+    Raises:
+        ValueError: If neither or both of schedule and ramp are given, or the
+            schedule is empty.
+    """
+    years = np.asarray(years)
+    if (schedule is None) == (ramp is None):
+        raise ValueError("Give one of schedule and ramp")
+
+    if ramp is not None:
+        start, end = int(ramp['start']), int(ramp['end'])
+        if end < start:
+            raise ValueError("ramp end must not be before its start")
+        share = np.clip((years - start + 1) / (end - start + 1), 0, 1)
+        return np.round(ramp['clinics'] * share)
+
+    if not schedule:
+        raise ValueError("schedule must give the clinics of at least one year")
+    schedule_years = np.array(sorted(int(year) for year in schedule))
+    clinics = np.array([schedule[key] for key in sorted(schedule, key=int)], dtype=float)
+    position = np.searchsorted(schedule_years, years, side='right') - 1
+    return np.where(position >= 0, clinics[np.maximum(position, 0)], 0)
+
+
+def simulate_rollout(capacity, susceptible, undiagnosed_ratio, economic_burden):
+    """
+    Carry the diagnosed stock year over year.
+
+    Each year the undiagnosed population is the untreated share of the
+    susceptible population minus everyone the clinics diagnosed before; the
+    clinics diagnose up to their capacity of it, and the burden of the rest
+    is valued at that year's burden per undiagnosed person (as in
+    intervention_impact).
+
+    Args:
+        capacity (np.ndarray): Intervention capacity, (scenario, year) or (year,).
+        susceptible (np.ndarray): Projected susceptible population, (scenario, year).
+        undiagnosed_ratio (np.ndarray): Share undiagnosed without the clinics, (scenario,).
+        economic_burden (np.ndarray): Projected economic burden of the undiagnosed, (scenario, year).
+
+    Returns:
+        dict: (scenario, year) arrays of 'undiagnosed_before', 'newly_diagnosed',
+        'diagnosed_stock', 'undiagnosed_after', 'economic_burden',
+        'economic_burden_after', 'burden_averted' and 'cumulative_burden_averted'.
+    """
+    untreated = susceptible * np.asarray(undiagnosed_ratio)[:, None]
+    capacity = np.broadcast_to(capacity, untreated.shape)
+
+    undiagnosed_before = np.empty_like(untreated)
+    newly_diagnosed = np.empty_like(untreated)
+    diagnosed_stock = np.zeros(len(untreated))
+    for year in range(untreated.shape[1]):
+        undiagnosed_before[:, year] = np.maximum(0, untreated[:, year] - diagnosed_stock)
+        newly_diagnosed[:, year] = np.minimum(capacity[:, year], undiagnosed_before[:, year])
+        diagnosed_stock = diagnosed_stock + newly_diagnosed[:, year]
+
+    undiagnosed_after = undiagnosed_before - newly_diagnosed
+
+    has_untreated = untreated > 0
+    burden_per_undiagnosed = np.where(has_untreated, economic_burden / np.where(has_untreated, untreated, 1), 0)
+    economic_burden_after = burden_per_undiagnosed * undiagnosed_after
+    burden_averted = economic_burden - economic_burden_after
+
+    return {
+        'undiagnosed_before': undiagnosed_before,
+        'newly_diagnosed': newly_diagnosed,
+        'diagnosed_stock': np.cumsum(newly_diagnosed, axis=1),
+        'undiagnosed_after': undiagnosed_after,
+        'economic_burden': np.asarray(economic_burden, dtype=float),
+        'economic_burden_after': economic_burden_after,
+        'burden_averted': burden_averted,
+        'cumulative_burden_averted': np.cumsum(burden_averted, axis=1),
+    }
@@ -1,35 +1,28 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import json
-import requests
-from model import Model
+from api_client import get_shared_client
+from app_cache import load_config, get_table, get_model, table_line_chart
 
-# Load JSON configuration
-with open('parameters.json') as f:
-    CONFIG = json.load(f)
-    
 
 def load_data():
-    prevalence_data = pd.read_csv('indonesia_ncd_prevalence_cleaned.csv', index_col=0)
-    econ_data = pd.read_csv('indonesia_ncd_economic_burden_cleaned.csv', index_col=0)
-    provinces_data = pd.read_csv('provinces_population.csv')
-    provinces_data['Population'] = provinces_data['Population'].fillna('0') \
-        .str.replace('"', '', regex=False).str.replace(',', '', regex=False).astype(int)
+    prevalence_data = get_table('indonesia_prevalence')
+    econ_data = get_table('indonesia_economic_burden')
+    provinces_data = get_table('provinces')
     return prevalence_data, econ_data, provinces_data
 
 def app():
     st.markdown('### How Big is the Problem Projected to 2034?')
 
+    CONFIG = load_config()
     prevalence_data, econ_data, provinces_data = load_data()
-    model = Model()
+    model = get_model()
 
     default_clinics = int(provinces_data['Number of Clinics'].values[-1])
     diseases = list(CONFIG['undiagnosed_ratio'].keys())
 
     selected_disease = st.selectbox('Select the Non-Communicable Diseases (NCD) of Interest:', diseases)
-    st.plotly_chart(model.line_chart(prevalence_data, selected_disease))
-    st.plotly_chart(model.line_chart_economy(econ_data, selected_disease))
+    st.plotly_chart(table_line_chart('indonesia_prevalence', selected_disease))
+    st.plotly_chart(table_line_chart('indonesia_economic_burden', selected_disease, economy=True))
 
     # st.markdown('#### At a Glance: Economic Burden of NCDs Compared')
     # fig_compare, df_long = model.line_chart_economy_disease_compare(econ_data, top=5)
@@ -66,9 +59,7 @@ def app():
         "capacity_pct": capacity_pct
     }
 
-    response = requests.post("http://localhost:5000/predict", json=payload)
-    # print(response)
-    result = response.json()
+    result = get_shared_client().post("/predict", payload)
 
     population = result["population"]
     susceptible = result["susceptible_population"]
@@ -1,36 +1,21 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import pickle
-from model import Model
-import requests
-import json
+from api_client import get_shared_client
+from app_cache import load_world_data, worldwide_total, country_projections, country_charts
+from forecasting import FORECASTERS, DEFAULT_FORECASTER
 
 
 
-world_data = pd.read_csv('world_data_cleaned_new_2.csv')
+world_data = load_world_data()
 
-country_list = world_data['Country'].unique()
+country_list = world_data.countries()
 
 
-model = Model()
+client = get_shared_client()
 
 capacity_yearly = 110400
 
-#create empty dataframe to store economic burden for each country and disease
-economic_burden_df = pd.DataFrame(columns=['Year', 'Economic Burden ($)'])
-
-for country in country_list:
-    for disease in world_data[world_data['Country'] == country]['Disease'].unique():
-        economic_burden_2 = model.transform_country_disease_new(world_data, country)
-        economic_burden_transformed_2 = model.extend_years_quadratic_increment(economic_burden_2, 2034)
-        temp_df = economic_burden_transformed_2[[disease]].reset_index().rename(columns={'index': 'Year', disease: 'Economic Burden ($)'})
-        temp_df['Year'] = pd.to_numeric(temp_df['Year'], errors='coerce')
-        economic_burden_df = pd.concat([economic_burden_df, temp_df], ignore_index=True)
-
-# Ensure Year is numeric and sum Economic Burden by Year
-economic_burden_df['Year'] = pd.to_numeric(economic_burden_df['Year'], errors='coerce')
-economic_burden_df = economic_burden_df.groupby('Year', as_index=False)['Economic Burden ($)'].sum()
+# project every country and disease at once, then sum Economic Burden by Year
+economic_burden_df = worldwide_total()
     
 
 
@@ -38,9 +23,6 @@ economic_burden_df = economic_burden_df.groupby('Year', as_index=False)['Economi
 # st.dataframe(economic_burden_df, use_container_width=True)
 
 
-economic_burden_df.to_csv('economic_burden_worldwide_total.csv', index=False)
-
-
 
 st.markdown('### How Big is the Problem Projected to 2030?')
 
@@ -48,22 +30,19 @@ selected_country = st.selectbox('Select Country', country_list)
 
 
 
-selected_disease = st.selectbox('Select the Non-Communicable Diseases (NCD) of Interest:', world_data[world_data['Country'] == selected_country]['Disease'].unique())
+selected_disease = st.selectbox('Select the Non-Communicable Diseases (NCD) of Interest:', world_data.diseases(selected_country))
 
+selected_forecaster = st.selectbox('Forecast Model', list(FORECASTERS), index=list(FORECASTERS).index(DEFAULT_FORECASTER))
 
 
 
 
-economic_burden = model.transform_country_disease_new(world_data, selected_country)
-economic_burden_transformed = model.extend_years_quadratic_increment(economic_burden, 2034)
 
-prevalence_data = model.transform_country_disease_prevalence_new(world_data, selected_country)
-prevalence_data_transformed = model.extend_years_quadratic_increment(prevalence_data, 2034)
+economic_burden_transformed, prevalence_data_transformed = country_projections(selected_country, forecaster=selected_forecaster)
 
 st.dataframe(prevalence_data_transformed)
 
-prevalence_forecast = model.line_chart(prevalence_data_transformed, selected_disease)
-economic_burden_forecast = model.line_chart_economy(economic_burden_transformed, selected_disease)
+economic_burden_forecast, prevalence_forecast = country_charts(selected_country, selected_disease, forecaster=selected_forecaster)
 
 # slice prevalence_data_transformed so that it only contain column of selected_disease
 prevalence_data_transformed_sliced = prevalence_data_transformed[[selected_disease]]
@@ -117,15 +96,8 @@ st.plotly_chart(prevalence_forecast)
 default_year = 2024
 select_year = st.slider('Select Year', min_value=default_year-10, max_value=default_year+10, step=1, value=default_year)
 
-payload = {
-    "country": selected_country,
-    "disease": selected_disease,
-    "year": select_year,
-    # "economic_burden_transformed": economic_burden_transformed.to_dict(),
-
-}
-
-response = requests.post("http://localhost:5000/predict_worldwide", json=payload)
+# filled in below, once the intervention inputs are known
+burden_section = st.container()
 
 
 # selected_dataframe = world_data[(world_data['Country'] == selected_country) & (world_data['Disease'] == selected_disease)]
@@ -153,33 +125,6 @@ response = requests.post("http://localhost:5000/predict_worldwide", json=payload
 
 # economic_burden_per_capita = economic_burden / susceptible_population
 
-results = response.json()
-
-st.write(results)
-
-select_year_old_population = results['population']
-susceptible_population_diagnosed = results['susceptible_population_diagnosed']
-economic_burden = results["economic_burden"]
-susceptible_population = results['susceptible_population']
-susceptible_population_undiagnosed = results['susceptible_population_undiagnosed']
-economic_burden_per_capita = results['economic_burden_per_capita']
-
-
-
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.metric('Population', f'{select_year_old_population:,.0f}', help='Population of age 40+ in the selected year.')
-    st.metric('Susceptible Population (Diagnosed)', f'{susceptible_population_diagnosed:,.0f}', help='Based on Diagnosed to Undiagnosed Ratio')
-    st.metric('Total Economic Burden (Yearly)', f'${economic_burden:,.0f}', help = 'Relative to Population of age 40%')
-    
-with col2:
-    st.metric('Susceptible Population', f'{susceptible_population:,.0f}', help='Relative to Prevalence (%)')
-    st.metric('Susceptible Population (Undiagnosed)', f'{susceptible_population_undiagnosed:,.0f}', help='Based on Diagnosed to Undiagnosed Ratio')
-    st.metric('Economic Burden per Capita (Yearly)', f'${economic_burden_per_capita:,.0f}')
-    st.caption('Economic Burden per Capita = Total Economic Burden / Susceptible Population')
-    
 st.divider()
 
 st.markdown('### Introducing our Intervention Solution: GMedCC Health Stores')
@@ -199,23 +144,42 @@ with col2:
     capacity_pct = st.number_input('Capacity Allocation (%) to NCD', min_value=1, max_value=100, value=20)
 
 
-payload_2 = {
+# burden and intervention impact in one call
+payload = {
     "country": selected_country,
-    "population": select_year_old_population,
     "disease": selected_disease,
-    "susceptible_undiagnosed": susceptible_population_undiagnosed,
-    "economic_burden": economic_burden,
-    "clinic_count": clinic_count,
-    "provider_count": provider_count,
-    "capacity_pct": capacity_pct
+    "year": select_year,
+    "clinics": clinic_count,
+    "providers": provider_count,
+    "capacity_pct": capacity_pct,
+    "forecaster": selected_forecaster
 }
 
+results = client.post("/scenario_worldwide", payload)
 
+select_year_old_population = results['population']
+susceptible_population_diagnosed = results['susceptible_population_diagnosed']
+economic_burden = results["economic_burden"]
+susceptible_population = results['susceptible_population']
+susceptible_population_undiagnosed = results['susceptible_population_undiagnosed']
+economic_burden_per_capita = results['economic_burden_per_capita']
 
-response = requests.post("http://localhost:5000/impact_worldwide", json=payload_2)
 
+with burden_section:
+    st.write(results)
 
-results = response.json()
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.metric('Population', f'{select_year_old_population:,.0f}', help='Population of age 40+ in the selected year.')
+        st.metric('Susceptible Population (Diagnosed)', f'{susceptible_population_diagnosed:,.0f}', help='Based on Diagnosed to Undiagnosed Ratio')
+        st.metric('Total Economic Burden (Yearly)', f'${economic_burden:,.0f}', help = 'Relative to Population of age 40%')
+        
+    with col2:
+        st.metric('Susceptible Population', f'{susceptible_population:,.0f}', help='Relative to Prevalence (%)')
+        st.metric('Susceptible Population (Undiagnosed)', f'{susceptible_population_undiagnosed:,.0f}', help='Based on Diagnosed to Undiagnosed Ratio')
+        st.metric('Economic Burden per Capita (Yearly)', f'${economic_burden_per_capita:,.0f}')
+        st.caption('Economic Burden per Capita = Total Economic Burden / Susceptible Population')
 
 intervention_capacity = results["intervention_capacity"]
 pct_undiag_after = results["pct_undiag_after"]
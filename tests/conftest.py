@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the data loaders read paths relative to the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
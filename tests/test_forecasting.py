@@ -0,0 +1,25 @@
+"""The forecaster registry."""
+import numpy as np
+import pytest
+
+from forecasting import FORECASTERS, Forecaster, get_forecaster
+
+
+def test_incomplete_forecaster_cannot_be_created():
+    class FitOnly(Forecaster):
+        name = 'fit_only'
+
+        def fit(self, years, values):
+            return self
+
+    with pytest.raises(TypeError):
+        FitOnly()
+
+
+@pytest.mark.parametrize('name', sorted(FORECASTERS))
+def test_registered_forecasters_extend_a_line(name):
+    years = np.arange(2019, 2025)
+    values = np.array([[10.0, 11, 12, 13, 14, 15], [5.0, 5.5, 6, 6.5, 7, 7.5]])
+    forecast = get_forecaster(name).fit(years, values).predict(np.array([2024]))
+    assert forecast.shape == (2, 1)
+    np.testing.assert_allclose(forecast[:, 0], values[:, -1], rtol=0.05)
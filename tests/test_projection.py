@@ -0,0 +1,83 @@
+"""
+Regression test of the closed-form quadratic increment projection.
+
+`baseline_extend_years_quadratic_increment` is the dict / per-year Series /
+pd.concat implementation that `ProjectionModel.extend_years_quadratic_increment`
+replaced; the vectorized path must reproduce it exactly.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_access import WorldData
+from projection import ProjectionModel
+
+
+def baseline_extend_years_quadratic_increment(transformed_df, projected_year):
+    def quadratic_increments(start, end, steps):
+        if steps <= 0:
+            return np.array([], dtype=float)
+        w = np.array([(i + 1) ** 2 for i in range(steps)], dtype=float)
+        w /= w.sum()
+        return w * (end - start)
+
+    df = transformed_df.copy()
+    years = list(df.index)
+    year_start, year_end = int(years[-2]), int(years[-1])
+    span = year_end - year_start
+
+    intermediate_years = list(range(year_start + 1, year_end))
+    quad_dict = {y: {} for y in intermediate_years}
+    avg_increments = {}
+
+    for col in df.columns:
+        start_val = df.loc[year_start, col]
+        end_val = df.loc[year_end, col]
+        inc = quadratic_increments(start_val, end_val, span)
+        if span > 1:
+            cums = start_val + np.cumsum(inc)[:span - 1]
+            for y, v in zip(intermediate_years, cums):
+                quad_dict[y][col] = v
+        avg_increments[col] = (end_val - start_val) / span
+
+    interpolated_df = pd.DataFrame(quad_dict).T if intermediate_years else pd.DataFrame(index=[], columns=df.columns)
+
+    pieces = [df.loc[[year_start]]]
+    if not interpolated_df.empty:
+        pieces.append(interpolated_df)
+    pieces.append(df.loc[[year_end]])
+    extended_df = pd.concat(pieces, axis=0)
+
+    if projected_year > year_end:
+        future_rows = {
+            y: extended_df.loc[year_end] + pd.Series(avg_increments) * (y - year_end)
+            for y in range(year_end + 1, projected_year + 1)
+        }
+        final_df = pd.concat([extended_df, pd.DataFrame(future_rows).T], axis=0)
+    else:
+        final_df = extended_df.loc[:projected_year]
+
+    final_df.index = final_df.index.astype(int)
+    return final_df.sort_index()
+
+
+WORLD_DATA = WorldData.from_store()
+MODEL = ProjectionModel()
+TRANSFORMS = {
+    'economic_burden': MODEL.transform_country_disease_new,
+    'prevalence': MODEL.transform_country_disease_prevalence_new,
+}
+
+
+# before, at the start of, inside, at the end of and after the 2014-2024 span
+@pytest.mark.parametrize('projected_year', [2010, 2014, 2019, 2024, 2034])
+@pytest.mark.parametrize('kind', list(TRANSFORMS))
+def test_matches_baseline_for_every_country(kind, projected_year):
+    for country in WORLD_DATA.countries():
+        transformed = TRANSFORMS[kind](WORLD_DATA, country)
+        expected = baseline_extend_years_quadratic_increment(transformed, projected_year)
+        result = MODEL.extend_years_quadratic_increment(transformed, projected_year)
+
+        assert result.index.tolist() == expected.index.tolist(), country
+        assert result.columns.tolist() == expected.columns.tolist(), country
+        np.testing.assert_array_equal(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), err_msg=country)
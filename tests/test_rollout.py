@@ -0,0 +1,57 @@
+"""/rollout carries the diagnosed stock over a susceptible population that follows the projected prevalence."""
+import numpy as np
+import pytest
+
+import flask_app
+from impact import WORLDWIDE_GROWTH_RATE
+from projection import ProjectionModel
+
+BODY = {"providers": 3, "capacity_pct": 20, "start_year": 2025, "end_year": 2034, "yearly": True}
+
+
+def projected_untreated(country, disease, years):
+    """Undiagnosed population without clinics, from the prevalence of extend_years_quadratic_increment."""
+    model = ProjectionModel()
+    prevalence = model.extend_years_quadratic_increment(
+        model.transform_country_disease_prevalence_new(flask_app.world_data, country), years[-1])[disease]
+    row = flask_app.world_data.frame.iloc[flask_app.world_data.positions(np.array([country]), np.array([disease]))[0]]
+    population = row['Population 40+'] * (1 + WORLDWIDE_GROWTH_RATE * (years - 2024))
+    return population * prevalence.loc[years].to_numpy() / 100 * row['% Undiagnosed Susceptible Population 40+']
+
+
+def test_susceptible_population_follows_projected_prevalence():
+    # no clinics: the undiagnosed population is the projected one, year by year
+    rollout = flask_app.compute_rollout({**BODY, "schedule": {"2025": 0}})
+    years = np.array(rollout["years"])
+
+    for scenario in rollout["scenarios"]:
+        expected = projected_untreated(scenario["country"], scenario["disease"], years)
+        np.testing.assert_allclose(scenario["yearly"]["undiagnosed_before"], expected, atol=0.5, rtol=0,
+                                   err_msg=f"{scenario['country']}, {scenario['disease']}")
+        assert scenario["yearly"]["burden_averted"] == [0] * len(years)
+
+
+@pytest.mark.parametrize('clinics', [1, 50])
+def test_diagnosed_stock_is_carried(clinics):
+    rollout = flask_app.compute_rollout({**BODY, "ramp": {"start": 2025, "end": 2029, "clinics": clinics}})
+    years = np.array(rollout["years"])
+
+    for scenario in rollout["scenarios"]:
+        yearly = {field: np.array(values, dtype=float) for field, values in scenario["yearly"].items()}
+        untreated = projected_untreated(scenario["country"], scenario["disease"], years)
+        diagnosed_before = np.concatenate([[0], yearly["diagnosed_stock"][:-1]])
+
+        # everyone diagnosed in earlier years stays diagnosed
+        np.testing.assert_allclose(yearly["undiagnosed_before"], np.maximum(0, untreated - diagnosed_before), atol=2, rtol=0)
+        # the projected burden is valued per undiagnosed person of the projected population,
+        # up to the rounding of the yearly series to whole people
+        has_untreated = untreated > 0
+        per_person = yearly["economic_burden"][has_untreated] / untreated[has_untreated]
+        error = yearly["economic_burden_after"][has_untreated] - per_person * yearly["undiagnosed_after"][has_untreated]
+        assert (np.abs(error) <= per_person + 1).all(), (scenario["country"], scenario["disease"])
+
+
+def test_empty_schedule_is_rejected():
+    client = flask_app.app.test_client()
+    response = client.post("/rollout", json={"schedule": {}, "providers": 3, "capacity_pct": 20})
+    assert response.status_code == 400
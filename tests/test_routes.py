@@ -0,0 +1,51 @@
+"""Malformed JSON bodies are answered with 400, not 500."""
+import pytest
+
+import flask_app
+
+POST_ROUTES = [
+    "/predict", "/predict/batch", "/predict_worldwide", "/scenario_worldwide", "/scenario_worldwide/batch",
+    "/impact_worldwide", "/predict/uncertainty", "/predict_worldwide/uncertainty", "/sensitivity",
+    "/optimize", "/optimize/batch", "/rollout", "/portfolio", "/portfolio/batch",
+]
+
+
+@pytest.fixture
+def client():
+    return flask_app.app.test_client()
+
+
+@pytest.mark.parametrize('route', POST_ROUTES)
+@pytest.mark.parametrize('body', [[1], 1, "body"])
+def test_non_object_body_is_rejected(client, route, body):
+    response = client.post(route, json=body)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+@pytest.mark.parametrize('route, body', [
+    ("/predict_worldwide/uncertainty", {"samples": 10, "distributions": {"growth_rate": 0.1}}),
+    ("/predict_worldwide/uncertainty", {"samples": 10, "distributions": [1]}),
+    ("/predict_worldwide/uncertainty", {"samples": 10, "seed": "abc"}),
+    ("/predict_worldwide/uncertainty", {"samples": 10, "seed": -1}),
+    ("/sensitivity", {"method": "sobol", "samples": 8, "seed": "abc"}),
+    ("/sensitivity", {"ranges": {"clinics": 1}}),
+    ("/sensitivity", {"ranges": [1]}),
+])
+def test_invalid_inputs_are_rejected(client, route, body):
+    response = client.post(route, json=body)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+@pytest.mark.parametrize('route, place', [
+    ("/predict/batch", {"province": "Bali"}),
+    ("/scenario_worldwide/batch", {"country": "Portugal"}),
+])
+def test_oversized_grid_is_rejected(client, route, place):
+    # 1000 x 1000 scenarios, far above batch.max_scenarios
+    grid = {**place, "disease": "Stroke", "year": 2030, "clinics": list(range(1000)), "providers": list(range(1000)),
+            "capacity_pct": 20}
+    response = client.post(route, json={"grid": grid})
+    assert response.status_code == 400
+    assert "max_scenarios" in response.get_json()["error"]
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 
+from forecasting import get_forecaster
+
 def calculate_linear_growth_rate(df: pd.DataFrame) -> float:
     """
     Calculate the average annual increase in prevalence using simple linear regression.
@@ -15,17 +17,13 @@ def calculate_linear_growth_rate(df: pd.DataFrame) -> float:
     if 'Year' not in df.columns or 'Prevalence' not in df.columns:
         raise ValueError("DataFrame must contain 'Year' and 'Prevalence' columns")
 
-    x = df['Year']
-    y = df['Prevalence'] * 100  # Convert decimal to percentage for interpretation
-
-    x_mean = x.mean()
-    y_mean = y.mean()
-
-    covariance = ((x - x_mean) * (y - y_mean)).mean()
-    variance = ((x - x_mean) ** 2).mean()
+    # same least-squares line as the 'linear' projection forecaster
+    df = df[['Year', 'Prevalence']].dropna()
+    if df['Year'].nunique() < 2:
+        raise ValueError("Need at least two different years")
 
-    slope = covariance / variance  # Percentage points per year
-    return slope / 100
+    forecaster = get_forecaster('linear').fit(df['Year'].to_numpy(float), df[['Prevalence']].to_numpy(float).T)
+    return float(forecaster.slope[0])  # Prevalence (decimal) per year
 
 # Example Data
 example_df = pd.DataFrame({
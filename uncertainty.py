@@ -0,0 +1,259 @@
+"""
+Monte Carlo uncertainty of the /predict and /predict_worldwide outputs.
+
+The point estimates of parameters.json and of the world data are replaced by
+samples drawn from the distributions configured under "uncertainty" in
+parameters.json, e.g.
+
+    "uncertainty": {
+        "growth_rate": {"dist": "normal", "rel_sd": 0.25},
+        "undiagnosed_ratio": {"dist": "beta", "concentration": 50}
+    }
+
+Every distribution is centered on the point estimate (see DISTRIBUTIONS);
+parameters without an entry stay fixed. Samples are pushed through the
+formulas of impact.py in one vectorized pass per chunk, and the chunks can be
+spread over a process pool. Each chunk draws from its own stream spawned from
+the seed, so results only depend on the seed and the number of samples, not
+on the number of processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from impact import intervention_impact, predict_baseline, worldwide_baseline
+from projection import ProjectionModel, backcast_multiplier
+
+
+CHUNK_SIZE = 50_000
+DEFAULT_PERCENTILES = [5, 50, 95]
+
+# Parameters sampled by each simulation
+PREDICT_PARAMETERS = ["growth_rate", "old_ratio", "undiagnosed_ratio", "capacity_yearly"]
+WORLDWIDE_PARAMETERS = ["economic_burden_growth", "undiagnosed_ratio", "capacity_yearly"]
+
+
+def _normal(rng, point, spec, size):
+    return point + rng.normal(0, abs(point) * spec['rel_sd'], size)
+
+
+def _lognormal(rng, point, spec, size):
+    # median at the point estimate
+    return point * rng.lognormal(0, spec['sigma'], size)
+
+
+def _uniform(rng, point, spec, size):
+    return point * rng.uniform(spec['low'], spec['high'], size)
+
+
+def _triangular(rng, point, spec, size):
+    return point * rng.triangular(spec['low'], 1, spec['high'], size)
+
+
+def _beta(rng, point, spec, size):
+    # mean at the point estimate; for shares in (0, 1)
+    if not 0 < point < 1:
+        return np.full(size, float(point))
+    return rng.beta(point * spec['concentration'], (1 - point) * spec['concentration'], size)
+
+
+# dist name -> sampler(rng, point, spec, size); spread parameters are relative to the point
+DISTRIBUTIONS = {
+    'normal': _normal,          # rel_sd: standard deviation as a fraction of the point
+    'lognormal': _lognormal,    # sigma: of the log of the multiplier
+    'uniform': _uniform,        # low, high: multipliers of the point
+    'triangular': _triangular,  # low, high: multipliers of the point, mode at the point
+    'beta': _beta,              # concentration: alpha + beta
+}
+
+
+def validate_spec(spec):
+    """
+    Raises:
+        ValueError: If a parameter's entry is not a mapping or its
+            distribution is unknown.
+    """
+    for name, entry in spec.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"Distribution of {name} must be an object with a 'dist', not {entry!r}")
+        dist = entry.get('dist', 'fixed')
+        if dist != 'fixed' and dist not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution for {name}: {dist}")
+
+
+def validate_seed(seed):
+    """
+    Raises:
+        ValueError: If the seed is neither None nor a non-negative integer.
+    """
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, (int, np.integer)) or seed < 0):
+        raise ValueError(f"seed must be a non-negative integer: {seed!r}")
+
+
+def sample_parameter(rng, name, point, spec, size):
+    """
+    Samples of a parameter around its point estimate.
+
+    Args:
+        rng (np.random.Generator): Random generator.
+        name (str): Parameter name, looked up in `spec`.
+        point (float or np.ndarray): Point estimate(s); arrays get one
+            column of samples per element.
+        spec (dict): Parameter name -> {'dist': ..., spread parameters}.
+        size (int): Number of samples.
+
+    Returns:
+        np.ndarray: Shape (size,) + np.shape(point).
+    """
+    entry = spec.get(name, {})
+    dist = entry.get('dist', 'fixed')
+
+    point = np.asarray(point, dtype=float)
+    if dist == 'fixed':
+        return np.broadcast_to(point, (size,) + point.shape)
+
+    sampler = DISTRIBUTIONS[dist]
+    if point.ndim == 0:
+        return sampler(rng, float(point), entry, size)
+    return np.stack([sampler(rng, float(p), entry, size) for p in point.ravel()], axis=-1).reshape((size,) + point.shape)
+
+
+def simulate_predict_chunk(inputs, spec, size, seed):
+    """
+    /predict fields of one scenario for `size` parameter samples.
+
+    Args:
+        inputs (dict): Point inputs of the scenario, see flask_app.compute_predict_uncertainty.
+        spec (dict): Distributions of the parameters.
+        size (int): Number of samples.
+        seed (np.random.SeedSequence): Stream of this chunk.
+
+    Returns:
+        dict: Field name -> np.ndarray of shape (size,).
+    """
+    rng = np.random.default_rng(seed)
+    growth_rate, old_ratio, undiagnosed_ratio, capacity_yearly = (
+        sample_parameter(rng, name, inputs[name], spec, size) for name in PREDICT_PARAMETERS
+    )
+
+    if inputs['province_population'] is None:
+        old_population = inputs['old_population_all']
+    else:
+        old_population = inputs['province_population'] * old_ratio
+
+    baseline = predict_baseline(old_population, inputs['old_population_all'], growth_rate, inputs['year'],
+                                inputs['prevalence_pct'], inputs['burden_unit_cost'], undiagnosed_ratio)
+    impact = intervention_impact(capacity_yearly, inputs['clinics'], inputs['providers'], inputs['capacity_pct'],
+                                 baseline['susceptible_undiagnosed'], undiagnosed_ratio, baseline['economic_burden'])
+
+    return {field: np.broadcast_to(values, (size,)) for field, values in {**baseline, **impact}.items()}
+
+
+def project_economic_burden(economic_burden, growth, position, year, projected_year, backcast='per_disease'):
+    """
+    Economic burden of one disease in `year` for sampled growth rates, with
+    the back-cast and quadratic projection of ProjectionModel.
+
+    Args:
+        economic_burden (np.ndarray): 2024 economic burden of every disease of the country.
+        growth (np.ndarray): Sampled 'Economic Burden Growth Yearly ($)', shape (samples, diseases).
+        position (int): Position of the disease among the country's diseases.
+        year (int): Selected year.
+        projected_year (int): The year the projection extends to.
+        backcast (str): 'per_disease' or 'shared', see
+            ProjectionModel.transform_country_disease_new.
+
+    Returns:
+        np.ndarray: Shape (samples,).
+    """
+    if backcast == 'shared':
+        # each sample's diseases share one multiplier
+        groups = np.repeat(np.arange(len(growth)), growth.shape[1])
+        multiplier = backcast_multiplier(np.tile(economic_burden, len(growth)), growth.ravel(), groups)
+        multiplier = multiplier.reshape(growth.shape)[:, position]
+    else:
+        multiplier = backcast_multiplier(np.full(len(growth), economic_burden[position]), growth[:, position])
+    past = economic_burden[position] - multiplier * growth[:, position]
+
+    pairs = np.stack([past, np.full(len(past), economic_burden[position])], axis=1)
+    years, values = ProjectionModel().quadratic_increment_matrix(pairs, 2014, 2024, projected_year)
+    return values[:, np.searchsorted(years, year)]
+
+
+def simulate_worldwide_chunk(inputs, spec, size, seed):
+    """
+    /predict_worldwide fields of one scenario for `size` parameter samples,
+    plus the intervention fields if the scenario has clinics.
+
+    Args:
+        inputs (dict): Point inputs of the scenario, see flask_app.compute_predict_worldwide_uncertainty.
+        spec (dict): Distributions of the parameters.
+        size (int): Number of samples.
+        seed (np.random.SeedSequence): Stream of this chunk.
+
+    Returns:
+        dict: Field name -> np.ndarray of shape (size,).
+    """
+    rng = np.random.default_rng(seed)
+    growth, undiagnosed_ratio, capacity_yearly = (
+        sample_parameter(rng, name, inputs[name], spec, size) for name in WORLDWIDE_PARAMETERS
+    )
+
+    economic_burden = project_economic_burden(inputs['economic_burden'], growth, inputs['disease_position'],
+                                              inputs['year'], inputs['projected_year'], inputs.get('backcast', 'per_disease'))
+
+    results = worldwide_baseline(inputs['old_population_all'], inputs['prevalence'], economic_burden,
+                                 inputs['year'], undiagnosed_ratio)
+    if inputs.get('clinics') is not None:
+        results.update(intervention_impact(capacity_yearly, inputs['clinics'], inputs['providers'], inputs['capacity_pct'],
+                                           results['susceptible_population_undiagnosed'], undiagnosed_ratio,
+                                           results['economic_burden']))
+
+    return {field: np.broadcast_to(values, (size,)) for field, values in results.items()}
+
+
+def simulate(chunk_function, inputs, spec, samples, seed=None, processes=None, percentiles=DEFAULT_PERCENTILES):
+    """
+    Run a simulation and summarize every output field as percentile bands.
+
+    Args:
+        chunk_function (callable): simulate_predict_chunk or simulate_worldwide_chunk.
+        inputs (dict): Point inputs of the scenario.
+        spec (dict): Distributions of the parameters.
+        samples (int): Number of parameter samples.
+        seed (int): Non-negative seed of the random streams; fresh entropy if None.
+        processes (int): Size of the process pool; in-process if None or 1.
+        percentiles (list): Percentiles of the bands.
+
+    Returns:
+        dict: 'samples', 'seed' (to reproduce the run) and 'bands',
+        field -> {'mean', 'p<percentile>', ...}.
+
+    Raises:
+        ValueError: If the spec, samples or seed are invalid.
+    """
+    validate_spec(spec)
+    if samples < 1:
+        raise ValueError("samples must be positive")
+    validate_seed(seed)
+
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = [CHUNK_SIZE] * (samples // CHUNK_SIZE) + ([samples % CHUNK_SIZE] if samples % CHUNK_SIZE else [])
+    seeds = seed_sequence.spawn(len(sizes))
+    arguments = ([inputs] * len(sizes), [spec] * len(sizes), sizes, seeds)
+
+    if processes and processes > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(min(processes, len(sizes))) as pool:
+            chunks = list(pool.map(chunk_function, *arguments))
+    else:
+        chunks = list(map(chunk_function, *arguments))
+
+    bands = {}
+    for field in chunks[0]:
+        values = np.concatenate([chunk[field] for chunk in chunks])
+        bands[field] = {
+            'mean': float(values.mean()),
+            **{f'p{q:g}': float(v) for q, v in zip(percentiles, np.percentile(values, percentiles))},
+        }
+
+    return {'samples': samples, 'seed': seed_sequence.entropy, 'bands': bands}